@@ -0,0 +1,343 @@
+import argparse
+import json
+import time
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+
+from agent.batch import LeadBatch
+from agent.exporter import atomic_write
+from agent.generator import DataGenerator
+
+# Leads are drawn in fixed-size blocks, each from its own (seed, block) RNG
+# stream, so lead i depends only on (seed, i): never on count or chunk size.
+BLOCK_SIZE = 1 << 16
+
+# 0..9999 as zero-padded ASCII digits, one row per number
+_DIGITS = np.frombuffer("".join(f"{i:04d}" for i in range(10_000)).encode(), dtype=np.uint8).reshape(-1, 4)
+
+
+def _json(value) -> str:
+    # Same compact encoding as pydantic's dump_json
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+class _Pools:
+    """
+    Every distinct value a generated field can take, built once from
+    DataGenerator's pools. Leads are drawn as indexes into these lists.
+    """
+
+    def __init__(self, gen: DataGenerator):
+        self.titles = gen.TITLES_HIGH + gen.TITLES_LOW
+        self.n_high_titles = len(gen.TITLES_HIGH)
+
+        # Company variants: high companies always open to NAMs; low ones either way
+        self.company_names = [c["name"] for c in gen.COMPANIES_HIGH + gen.COMPANIES_LOW]
+        self.n_high_companies = len(gen.COMPANIES_HIGH)
+        self.companies = [
+            {
+                "name": c["name"],
+                "industry": "Biotech",
+                "location_hq": c["hq"],
+                "funding_stage": c["funding"],
+                "uses_invitro_tech": c["invitro"],
+                "open_to_nams": True,
+            }
+            for c in gen.COMPANIES_HIGH
+        ] + [
+            {
+                "name": c["name"],
+                "industry": "Pharma",
+                "location_hq": c["hq"],
+                "funding_stage": c["funding"],
+                "uses_invitro_tech": c["invitro"],
+                "open_to_nams": nams,
+            }
+            for c in gen.COMPANIES_LOW
+            for nams in (False, True)
+        ]
+
+        hqs = [c["hq"] for c in gen.COMPANIES_HIGH + gen.COMPANIES_LOW]
+        self.locations = list(dict.fromkeys(gen.LOCATIONS + gen.REMOTE_LOCATIONS + hqs))
+        position = {loc: i for i, loc in enumerate(self.locations)}
+        self.location_ids = np.array([position[l] for l in gen.LOCATIONS])
+        self.location_is_remote = np.array(["Remote" in l for l in gen.LOCATIONS])
+        self.remote_ids = np.array([position[l] for l in gen.REMOTE_LOCATIONS])
+        self.hq_ids = np.array([position[h] for h in hqs])
+
+        self.papers = list(gen.PAPERS)
+        self.n_high_papers = gen.HIGH_PAPERS
+
+        # People: first x last name; emails also depend on the company name
+        self.n_first, self.n_last = len(gen.FIRST_NAMES), len(gen.LAST_NAMES)
+        people = [(f, l) for f in gen.FIRST_NAMES for l in gen.LAST_NAMES]
+        self.names = [f"{f} {l}" for f, l in people]
+        self.linkedin_urls = [f"linkedin.com/in/{f.lower()}{l.lower()}" for f, l in people]
+        self.emails = [
+            f"{f.lower()}.{l.lower()}@{company.lower().replace(' ', '')}.com"
+            for f, l in people
+            for company in self.company_names
+        ]
+
+        # NDJSON fragments: each ends where the next field starts
+        obj = lambda values: np.array([v.encode() for v in values], dtype=object)
+        self.frag_name = obj(['","name":' + _json(v) for v in self.names])
+        self.frag_title = obj([',"title":' + _json(v) for v in self.titles])
+        self.frag_company = obj([',"company":' + _json(c) for c in self.companies])
+        self.frag_location = obj([',"location_person":' + _json(v) for v in self.locations])
+        self.frag_email = obj([',"email":' + _json(v) for v in self.emails])
+        self.frag_linkedin = obj([',"linkedin_url":' + _json(v) + ',"phone":null' for v in self.linkedin_urls])
+        tail = ',"score":0.0,"score_mask":0,"score_keys":0,"rank_tier":"Low"}\n'
+        # Index 0: no publication; i + 1: papers[i]
+        self.frag_publications = obj(
+            [',"publications":[]' + tail] + [',"publications":' + _json([p]) + tail for p in self.papers]
+        )
+
+
+@dataclass
+class BulkChunk:
+    """
+    One chunk of generated leads as index arrays into _Pools. `paper` is -1
+    for leads without a publication.
+    """
+    ids: np.ndarray
+    title: np.ndarray
+    company: np.ndarray
+    company_name: np.ndarray
+    location: np.ndarray
+    person: np.ndarray
+    paper: np.ndarray
+
+    def __len__(self):
+        return len(self.ids)
+
+    def head(self, n: int) -> "BulkChunk":
+        return BulkChunk(*(getattr(self, f.name)[:n] for f in fields(self)))
+
+    @classmethod
+    def concat(cls, chunks: List["BulkChunk"]) -> "BulkChunk":
+        return cls(*(np.concatenate([getattr(c, f.name) for c in chunks]) for f in fields(cls)))
+
+
+class BulkGenerator:
+    """
+    Seeded, vectorized counterpart of DataGenerator for load testing: each
+    chunk's categorical fields are drawn at once as NumPy index arrays with
+    the same distribution, and written straight to NDJSON or a columnar file.
+    IDs are UUID-shaped and derived from (seed, lead number). The same seed
+    always yields the same leads; a smaller count yields a prefix.
+    """
+
+    def __init__(self, seed: int = 0, chunk_size: int = 1_000_000):
+        self.seed = seed
+        # Written chunks are whole blocks (the last one truncated)
+        self.chunk_size = max(1, -(-chunk_size // BLOCK_SIZE)) * BLOCK_SIZE
+        self.gen = DataGenerator()
+        self.pools = _Pools(self.gen)
+
+    def iter_chunks(self, count: int) -> Iterator[BulkChunk]:
+        for start in range(0, count, self.chunk_size):
+            n = min(self.chunk_size, count - start)
+            first, last = start // BLOCK_SIZE, (start + n - 1) // BLOCK_SIZE
+            blocks = [self._draw_block(block) for block in range(first, last + 1)]
+            chunk = blocks[0] if len(blocks) == 1 else BulkChunk.concat(blocks)
+            yield chunk.head(n)
+
+    def _draw_block(self, block: int) -> BulkChunk:
+        gen, pools = self.gen, self.pools
+        rng = np.random.default_rng([self.seed, block])
+        start, n = block * BLOCK_SIZE, BLOCK_SIZE
+        # One uniform per random decision, all drawn in a single call
+        u = rng.random((12, n))
+
+        def pick(row, good, high, size):
+            # Uniform choice from pool[:high] for good targets, pool[high:size] otherwise
+            return np.where(good, 0, high) + (u[row] * np.where(good, high, size - high)).astype(np.intp)
+
+        # Weigh randomness to ensure we have some "Good" leads (approx 20%)
+        good = u[0] < gen.GOOD_TARGET_RATE
+        title = pick(1, good, pools.n_high_titles, len(pools.titles))
+        company_name = pick(2, good, pools.n_high_companies, len(pools.company_names))
+        low_nams = u[3] < gen.LOW_NAMS_RATE
+        company = np.where(
+            good,
+            company_name,
+            pools.n_high_companies + 2 * (company_name - pools.n_high_companies) + low_nams,
+        )
+
+        has_paper = u[4] < np.where(good, gen.HIGH_PAPER_RATE, gen.LOW_PAPER_RATE)
+        paper = np.where(has_paper, pick(5, good, pools.n_high_papers, len(pools.papers)), -1)
+
+        # Remote people pick a remote location; others are often at HQ
+        n_locations = len(pools.location_ids)
+        remote = pools.location_is_remote[(u[6] * n_locations).astype(np.intp)]
+        location = np.where(
+            remote,
+            pools.remote_ids[(u[7] * len(pools.remote_ids)).astype(np.intp)],
+            np.where(
+                u[8] < gen.HQ_LOCATION_RATE,
+                pools.hq_ids[company_name],
+                pools.location_ids[(u[9] * n_locations).astype(np.intp)],
+            ),
+        )
+
+        person = (u[10] * pools.n_first).astype(np.intp) * pools.n_last + (u[11] * pools.n_last).astype(np.intp)
+
+        return BulkChunk(self._ids(start, n), title, company, company_name, location, person, paper)
+
+    def _ids(self, start: int, n: int) -> np.ndarray:
+        """
+        UUID-shaped IDs "<seed>-0000-4000-8000-<12-digit lead number>" as a
+        fixed-width bytes array, built four digits at a time from a lookup
+        table instead of formatting each number.
+        """
+        prefix = f"{self.seed & 0xFFFFFFFF:08x}-0000-4000-8000-".encode()
+        width = len(prefix)
+        ids = np.empty((n, width + 12), dtype=np.uint8)
+        ids[:, :width] = np.frombuffer(prefix, dtype=np.uint8)
+        numbers = np.arange(start, start + n, dtype=np.int64)
+        for i, scale in enumerate((10 ** 8, 10 ** 4, 1)):
+            ids[:, width + 4 * i:width + 4 * i + 4] = _DIGITS[numbers // scale % 10_000]
+        return ids.view(f"S{ids.shape[1]}").ravel()
+
+    # --- Output ---
+
+    def ndjson_lines(self, chunk: BulkChunk) -> bytes:
+        """
+        The chunk as NDJSON in Lead.model_dump_json() layout, joined in one
+        pass from pre-encoded per-value fragments (no per-lead JSON encoding).
+        """
+        p = self.pools
+        parts = np.empty((len(chunk), 9), dtype=object)
+        parts[:, 0] = b'{"id":"'
+        parts[:, 1] = chunk.ids
+        parts[:, 2] = p.frag_name[chunk.person]
+        parts[:, 3] = p.frag_title[chunk.title]
+        parts[:, 4] = p.frag_company[chunk.company]
+        parts[:, 5] = p.frag_location[chunk.location]
+        parts[:, 6] = p.frag_email[chunk.person * len(p.company_names) + chunk.company_name]
+        parts[:, 7] = p.frag_linkedin[chunk.person]
+        parts[:, 8] = p.frag_publications[chunk.paper + 1]
+        return b"".join(parts.ravel().tolist())
+
+    def arrow_table(self, chunk: BulkChunk):
+        """
+        The chunk as an Arrow table with exporter.flatten_lead's columns.
+        """
+        import pyarrow as pa
+
+        p = self.pools
+        n = len(chunk)
+        take = lambda values, index, type=None: pa.array(values, type=type).take(pa.array(index))
+        has_paper = chunk.paper >= 0
+        offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(has_paper, out=offsets[1:])
+        companies = p.companies
+
+        return pa.table({
+            # Fixed-width IDs: the bytes become the string column's data buffer as is
+            "id": pa.StringArray.from_buffers(
+                n,
+                pa.py_buffer(np.arange(0, (n + 1) * chunk.ids.itemsize, chunk.ids.itemsize, dtype=np.int32)),
+                pa.py_buffer(np.ascontiguousarray(chunk.ids)),
+            ),
+            "name": take(p.names, chunk.person),
+            "title": take(p.titles, chunk.title),
+            "location_person": take(p.locations, chunk.location),
+            "email": take(p.emails, chunk.person * len(p.company_names) + chunk.company_name),
+            "linkedin_url": take(p.linkedin_urls, chunk.person),
+            "phone": pa.nulls(n, pa.string()),
+            "publications": pa.ListArray.from_arrays(offsets, take(p.papers, chunk.paper[has_paper], pa.string())),
+            "score": pa.array(np.zeros(n)),
+            "score_mask": pa.array(np.zeros(n, dtype=np.int64)),
+            "score_keys": pa.array(np.zeros(n, dtype=np.int64)),
+            "rank_tier": take(["Low"], np.zeros(n, dtype=np.int64)),
+            **{
+                f"company_{key}": take([c[key] for c in companies], chunk.company, pa.string() if key == "funding_stage" else None)
+                for key in companies[0]
+            },
+        })
+
+    def to_batch(self, chunk: BulkChunk) -> LeadBatch:
+        """
+        The chunk as a LeadBatch, to load-test ProbabilityEngine.rank_batch
+        without materializing leads.
+        """
+        p = self.pools
+        column = lambda values, index: np.array(values, dtype=object)[index]
+        company = lambda key: column([c[key] for c in p.companies], chunk.company)
+        has_paper = chunk.paper >= 0
+        offsets = np.zeros(len(chunk) + 1, dtype=np.int64)
+        np.cumsum(has_paper, out=offsets[1:])
+        return LeadBatch(
+            title=column(p.titles, chunk.title),
+            company_name=company("name"),
+            funding_stage=company("funding_stage"),
+            uses_invitro_tech=company("uses_invitro_tech").astype(bool),
+            open_to_nams=company("open_to_nams").astype(bool),
+            location_person=column(p.locations, chunk.location),
+            location_hq=company("location_hq"),
+            publications=column(p.papers, chunk.paper[has_paper]),
+            publication_offsets=offsets,
+        )
+
+    def _write_ndjson(self, count: int, f):
+        for chunk in self.iter_chunks(count):
+            f.write(self.ndjson_lines(chunk))
+
+    def _write_columnar(self, count: int, f, fmt: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for chunk in self.iter_chunks(count):
+                table = self.arrow_table(chunk)
+                if writer is None:
+                    writer = pa.ipc.new_file(f, table.schema) if fmt == "arrow" else pq.ParquetWriter(f, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+
+    def write(self, path: str, count: int, fmt: str = "ndjson") -> str:
+        """
+        Writes `count` leads to `path` chunk by chunk (atomically, via
+        exporter.atomic_write). Formats: ndjson, arrow, parquet.
+        """
+        writers: Dict[str, Callable] = {
+            "ndjson": lambda f: self._write_ndjson(count, f),
+            "arrow": lambda f: self._write_columnar(count, f, "arrow"),
+            "parquet": lambda f: self._write_columnar(count, f, "parquet"),
+        }
+        if fmt not in writers:
+            raise ValueError(f"Unknown bulk format '{fmt}'. Available: {', '.join(writers)}")
+        if fmt != "ndjson":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError as e:
+                raise ImportError("Columnar output needs pyarrow: pip install pyarrow") from e
+        atomic_write(path, writers[fmt])
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeded bulk synthetic leads for load testing.")
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", default="ndjson", choices=["ndjson", "arrow", "parquet"])
+    parser.add_argument("--out", default=None, help="Defaults to agent/.cache/bulk_leads.<format>")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    out = args.out or f"agent/.cache/bulk_leads.{args.format}"
+    start = time.perf_counter()
+    BulkGenerator(seed=args.seed, chunk_size=args.chunk_size).write(out, args.count, fmt=args.format)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Wrote {args.count:,} leads to {out} in {elapsed:.2f}s ({args.count / elapsed:,.0f} leads/s)")
+
+
+if __name__ == "__main__":
+    main()
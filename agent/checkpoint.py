@@ -0,0 +1,97 @@
+import json
+import os
+from typing import List, Optional, Set, Tuple
+
+from agent.exporter import atomic_write
+from agent.records import CompanyTable, LeadRecord
+
+
+class RunJournal:
+    """
+    Append-only NDJSON journal of a main_real run. The first line identifies
+    the run (keywords, limits); each later line records one processed paper
+    by PMID together with the leads extracted from it. A restarted run with
+    the same identity replays the journal instead of refetching those papers.
+    """
+
+    def __init__(self, path: str, run_key: dict, fsync_every: int = 200):
+        self.path = path
+        self.run_key = run_key
+        # Flush every record to the OS; fsync once per efetch-chunk worth of papers
+        self.fsync_every = fsync_every
+        self.pending = 0
+        self.file = None
+
+    def load(self, companies: Optional[CompanyTable] = None) -> Tuple[Set[str], List[LeadRecord]]:
+        """
+        Returns (processed PMIDs, extracted leads) from a previous attempt of
+        the same run, and opens the journal for appending. A journal from a
+        different run, or an unreadable one, is discarded. Restored companies
+        are interned in `companies`.
+        """
+        companies = CompanyTable() if companies is None else companies
+        done_pmids = set()
+        leads = []
+        resumable = False
+
+        if os.path.exists(self.path):
+            with open(self.path, "r") as f:
+                for i, line in enumerate(f):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn last line from a crash mid-write; everything before it is valid
+                        break
+                    if i == 0:
+                        resumable = record.get("run") == self.run_key
+                        if not resumable:
+                            break
+                        continue
+                    done_pmids.add(record["pmid"])
+                    leads.extend(LeadRecord.from_dict(d, companies) for d in record["leads"])
+
+        if not resumable:
+            done_pmids, leads = set(), []
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w") as f:
+                f.write(json.dumps({"run": self.run_key}) + "\n")
+        else:
+            # Rewrite without any torn tail so appends start on a clean line
+            self._compact()
+
+        self.file = open(self.path, "a")
+        return done_pmids, leads
+
+    def _compact(self):
+        def write_clean(dst):
+            with open(self.path, "r") as src:
+                for line in src:
+                    try:
+                        json.loads(line)
+                    except ValueError:
+                        break
+                    dst.write(line if line.endswith("\n") else line + "\n")
+
+        atomic_write(self.path, write_clean, mode="w")
+
+    def record_paper(self, pmid: str, leads: List[LeadRecord]):
+        self.file.write(json.dumps({"pmid": pmid, "leads": [l.to_dict() for l in leads]}) + "\n")
+        self.file.flush()
+        self.pending += 1
+        if self.pending >= self.fsync_every:
+            os.fsync(self.file.fileno())
+            self.pending = 0
+
+    def close(self):
+        if self.file is not None and not self.file.closed:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+    def complete(self):
+        """
+        The run finished and its output is written; the next run starts fresh.
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
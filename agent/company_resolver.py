@@ -0,0 +1,107 @@
+import hashlib
+import json
+import re
+import unicodedata
+from typing import List, NamedTuple, Optional
+
+from agent.json_cache import JsonLRUCache
+
+# Substring markers, matched against the lowercased affiliation
+INDUSTRY_INDICATORS = [
+    " inc", " ltd", " llc", " gmbh", "pharma", "biotech",
+    "therapeutics", "biosciences", "laboratories", "technologies",
+    "corp", "company",
+]
+# university/hospital exclusion
+ACADEMIC_INDICATORS = ["university", "college", "school of", "hospital", "clinic", "institute", "univ"]
+# Pharma/Biotech markers: industry even if "Institute" is present (e.g. Novartis Institute)
+STRONG_INDUSTRY_INDICATORS = ["pharma", "biotech", "therapeutics", "biosciences"]
+
+# Legal-form and filler words that don't distinguish one company from another
+COMPANY_STOPWORDS = {
+    "inc", "incorporated", "ltd", "limited", "llc", "gmbh", "ag", "sa", "plc",
+    "corp", "corporation", "co", "company", "the", "and",
+}
+COMPANY_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def ascii_lower(text: str) -> str:
+    # "Müller" -> "muller", so accented and unaccented spellings compare equal
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+
+
+def company_key(company: str) -> str:
+    """
+    Normalized company identity: "Vertex Pharmaceuticals, Inc." and
+    "VERTEX PHARMACEUTICALS" share the key "vertex pharmaceuticals".
+    """
+    tokens = COMPANY_TOKEN_RE.findall(ascii_lower(company))
+    return " ".join(t for t in tokens if t not in COMPANY_STOPWORDS)
+
+
+def _substring_pattern(markers: List[str]) -> re.Pattern:
+    # One alternation per marker list: a single scan instead of one `in` per marker
+    return re.compile("|".join(re.escape(m) for m in sorted(markers, key=len, reverse=True)))
+
+
+class Affiliation(NamedTuple):
+    is_industry: bool
+    company: str      # display name, e.g. "Genentech Inc"
+    company_key: str  # normalized, e.g. "genentech"
+
+
+class CompanyResolver:
+    """
+    Classifies raw affiliation strings (industry vs. academic) and extracts
+    the company, behind a bounded LRU cache that can persist across runs.
+    The same affiliation typically appears on thousands of papers; each
+    distinct string is classified once. Cache files written under different
+    indicator lists are discarded.
+    """
+
+    def __init__(self, path: Optional[str] = "agent/.cache/company_cache.json", max_entries: int = 100_000):
+        self.industry_re = _substring_pattern(INDUSTRY_INDICATORS)
+        self.academic_re = _substring_pattern(ACADEMIC_INDICATORS)
+        self.strong_re = _substring_pattern(STRONG_INDUSTRY_INDICATORS)
+        # Affiliation string -> Affiliation
+        self.cache = JsonLRUCache(path, max_entries, decode=Affiliation)
+        self.cache.load(self._rules_version())
+
+    @staticmethod
+    def _rules_version() -> str:
+        rules = {
+            "industry": INDUSTRY_INDICATORS,
+            "academic": ACADEMIC_INDICATORS,
+            "strong": STRONG_INDUSTRY_INDICATORS,
+            "stopwords": sorted(COMPANY_STOPWORDS),
+            "fields": Affiliation._fields,
+        }
+        return hashlib.sha256(json.dumps(rules, sort_keys=True).encode()).hexdigest()[:16]
+
+    def is_industry(self, text: str) -> bool:
+        """
+        Same decision as the original substring heuristic, from one scan per
+        marker list.
+        """
+        text = text.lower()
+        if self.strong_re.search(text):
+            return True
+        return self.industry_re.search(text) is not None and self.academic_re.search(text) is None
+
+    def _classify(self, affiliation: str) -> Affiliation:
+        # Take first part like "Vertex Pharma", cleaned up roughly
+        company = affiliation.partition(",")[0].strip().replace(".", "")
+        return Affiliation(self.is_industry(affiliation), company, company_key(company))
+
+    def resolve(self, affiliation: str) -> Affiliation:
+        entry = self.cache.get(affiliation)
+        if entry is None:
+            entry = self._classify(affiliation)
+            self.cache.put(affiliation, entry)
+        return entry
+
+    def save(self):
+        self.cache.save()
+
+    def stats(self) -> str:
+        return self.cache.stats()
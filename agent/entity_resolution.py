@@ -0,0 +1,109 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from agent.company_resolver import ascii_lower, company_key
+from agent.records import LeadRecord
+from agent.scrapers.linkedin_discoverer import is_search_url, linkedin_search_url
+
+NAME_TOKEN_RE = re.compile(r"[a-z]+(?:['-][a-z]+)*")
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "phd", "md"}
+
+
+def split_name(name: str) -> Tuple[List[str], str]:
+    """
+    (given-name tokens, surname) of a "ForeName LastName" author string.
+    Initials keep their single letter: "J. R. Smith" -> (["j", "r"], "smith").
+    """
+    tokens = [t for t in NAME_TOKEN_RE.findall(ascii_lower(name)) if t not in NAME_SUFFIXES]
+    if not tokens:
+        return [], ""
+    return tokens[:-1], tokens[-1]
+
+
+def block_key(lead: LeadRecord) -> Optional[tuple]:
+    """
+    Blocking key (surname, first initial, company key). Only leads in the
+    same block are ever compared, which keeps resolution near-linear.
+    """
+    given, surname = split_name(lead.name)
+    if not surname:
+        return None
+    return surname, given[0][0] if given else "", company_key(lead.company.name)
+
+
+def given_names_compatible(a: List[str], b: List[str]) -> bool:
+    """
+    "J" matches "John", "John R" matches "John Robert"; "John" vs "James"
+    (or "John A" vs "John B") are different people. Missing names match.
+    """
+    for x, y in zip(a, b):
+        if len(x) == 1 or len(y) == 1:
+            if x[0] != y[0]:
+                return False
+        elif x != y:
+            return False
+    return True
+
+
+class EntityResolver:
+    """
+    Merges leads that refer to the same person at the same company. Incoming
+    leads are looked up in a blocking index and compared only against the
+    entities in their block; a match absorbs the lead (publications are
+    unioned, the fuller name, a real email and a real profile URL are kept).
+    """
+
+    def __init__(self):
+        self.entities: List[LeadRecord] = []
+        self.blocks: Dict[tuple, List[int]] = {}
+        # Parsed given names per entity, so comparisons never re-parse
+        self._given: List[List[str]] = []
+        self.merged = 0
+
+    def add(self, lead: LeadRecord) -> Tuple[LeadRecord, bool]:
+        """
+        Returns (entity, is_new). When the lead merges into an existing
+        entity, that entity is updated in place and returned.
+        """
+        key = block_key(lead)
+        given = split_name(lead.name)[0]
+        if key is not None:
+            for i in self.blocks.get(key, ()):
+                if given_names_compatible(self._given[i], given):
+                    self._merge(i, lead, given)
+                    self.merged += 1
+                    return self.entities[i], False
+
+        self.entities.append(lead)
+        self._given.append(given)
+        if key is not None:
+            self.blocks.setdefault(key, []).append(len(self.entities) - 1)
+        return lead, True
+
+    def _merge(self, i: int, lead: LeadRecord, given: List[str]):
+        entity = self.entities[i]
+        entity.publications = tuple(dict.fromkeys(entity.publications + tuple(lead.publications)))
+        # "John R Smith" is more useful than "J. Smith"
+        if sum(map(len, given)) > sum(map(len, self._given[i])):
+            entity.name = lead.name
+            self._given[i] = given
+        if entity.email == "Unavailable" and lead.email != "Unavailable":
+            entity.email = lead.email
+        # A found profile beats the search fallback, which must search for the kept name
+        if is_search_url(entity.linkedin_url):
+            if lead.linkedin_url and not is_search_url(lead.linkedin_url):
+                entity.linkedin_url = lead.linkedin_url
+            else:
+                entity.linkedin_url = linkedin_search_url(entity.name)
+
+    def resolve(self, leads: Iterable[LeadRecord]) -> List[LeadRecord]:
+        for lead in leads:
+            self.add(lead)
+        return self.entities
+
+    def stats(self) -> str:
+        return f"{len(self.entities)} entities, {self.merged} duplicates merged, {len(self.blocks)} blocks"
+
+
+def resolve_entities(leads: Iterable[LeadRecord]) -> List[LeadRecord]:
+    return EntityResolver().resolve(leads)
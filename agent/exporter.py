@@ -0,0 +1,166 @@
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from pydantic import TypeAdapter
+
+from agent import instrumentation
+from agent.models import Lead
+
+_LEAD_LIST = TypeAdapter(List[Lead])
+
+# Left out of exports unless asked for: the breakdown text can always be
+# rendered from score_mask/score_keys (see ScoringRules.render)
+LAZY_FIELDS = {"score_breakdown"}
+
+
+def flatten_lead(lead: Lead, exclude: Optional[Set[str]] = None) -> dict:
+    """
+    One flat record per lead: company fields are prefixed with `company_`,
+    matching the columns the Streamlit dashboard works with.
+    """
+    data = lead.model_dump(exclude=exclude)
+    company = data.pop("company")
+    data.update({f"company_{k}": v for k, v in company.items()})
+    return data
+
+
+def _write_json(leads: Iterable[Lead], f, exclude: Optional[Set[str]] = None):
+    # pydantic-core's Rust serializer encodes the whole list in one call, compactly
+    f.write(_LEAD_LIST.dump_json(list(leads), exclude={"__all__": exclude} if exclude else None))
+
+
+def _write_ndjson(leads: Iterable[Lead], f, exclude: Optional[Set[str]] = None):
+    # One lead per line, written as it arrives so generators never materialize
+    for lead in leads:
+        f.write(lead.__pydantic_serializer__.to_json(lead, exclude=exclude))
+        f.write(b"\n")
+
+
+def _arrow_table(leads: Iterable[Lead], exclude: Optional[Set[str]] = None):
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Columnar export needs pyarrow: pip install pyarrow") from e
+
+    records = [flatten_lead(lead, exclude) for lead in leads]
+    return pa.Table.from_pylist(records) if records else pa.table({})
+
+
+def _write_parquet(leads: Iterable[Lead], f, exclude: Optional[Set[str]] = None):
+    import pyarrow.parquet as pq
+    pq.write_table(_arrow_table(leads, exclude), f)
+
+
+def _write_arrow(leads: Iterable[Lead], f, exclude: Optional[Set[str]] = None):
+    import pyarrow as pa
+    table = _arrow_table(leads, exclude)
+    with pa.ipc.new_file(f, table.schema) as writer:
+        writer.write_table(table)
+
+
+# Format name -> writer(leads, binary file, exclude: field names to leave out).
+# Extend with register_exporter.
+EXPORTERS: Dict[str, Callable] = {
+    "json": _write_json,
+    "ndjson": _write_ndjson,
+    "parquet": _write_parquet,
+    "arrow": _write_arrow,
+}
+
+
+def register_exporter(fmt: str, writer: Callable):
+    EXPORTERS[fmt] = writer
+
+
+def _atomic_link_or_copy(src: str, dst: str):
+    """
+    Places `dst` as a hardlink to `src` (falls back to a copy across
+    filesystems), swapped in atomically so readers never see a partial file.
+    """
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    tmp = f"{dst}.{os.getpid()}.tmp"
+    try:
+        os.link(src, tmp)
+    except OSError:
+        shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+
+def atomic_write(path: str, write: Callable, mode: str = "wb"):
+    """
+    Calls write(file) on a temp file next to `path` (binary unless
+    `mode="w"`), then renames it into place, so readers only ever see the
+    previous or the complete file. The temp name is unique per call, so
+    concurrent writers of the same path never share a temp file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            write(f)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def export_leads(
+    leads: Iterable[Lead],
+    path: str,
+    fmt: str = "json",
+    copies: Sequence[str] = (),
+    breakdown: bool = False,
+) -> str:
+    """
+    Serializes `leads` once in `fmt` to `path` (temp file + rename, so the
+    write is atomic) and mirrors the result to each of `copies` by hardlink.
+    score_breakdown is only written with `breakdown=True` (render it first,
+    e.g. with ProbabilityEngine.explain).
+    """
+    if fmt not in EXPORTERS:
+        raise ValueError(f"Unknown export format '{fmt}'. Available: {', '.join(EXPORTERS)}")
+
+    exclude = None if breakdown else LAZY_FIELDS
+    with instrumentation.current().stage(f"export.{fmt}"):
+        atomic_write(path, lambda f: EXPORTERS[fmt](leads, f, exclude))
+
+    for copy_path in copies:
+        _atomic_link_or_copy(path, copy_path)
+    return path
+
+
+def export_run_artifacts(
+    leads: Sequence[Lead],
+    output_file: str,
+    backup_file: str,
+    rules,
+    breakdown: bool = False,
+):
+    """
+    Everything a pipeline run publishes next to `output_file` (JSON):
+    - the JSON export, hardlinked to `backup_file`
+    - the scoring rule spec (<name>.rules.json), to render breakdowns on demand
+    - the inverted search index (<name>.index.npz)
+    - the Arrow store (<name>.arrow) the Streamlit dashboard memory-maps,
+      skipped when pyarrow is missing
+    """
+    # Imported here: both modules import atomic_write from this one
+    from agent.scoring_rules import write_export_rules
+    from agent.search_index import write_search_index
+
+    # Serialize once (compact, atomic write) and hardlink the backup to it
+    export_leads(leads, output_file, fmt="json", copies=[backup_file], breakdown=breakdown)
+    write_export_rules(rules, output_file)
+    # Saved next to the export, so search never rebuilds the index on load
+    with instrumentation.current().stage("export.search_index"):
+        write_search_index(leads, output_file)
+
+    try:
+        export_leads(leads, os.path.splitext(output_file)[0] + ".arrow", fmt="arrow", breakdown=breakdown)
+    except ImportError as e:
+        print(f"   -> Skipping columnar lead store: {e}")
@@ -1,45 +1,68 @@
 import random
 import uuid
-from agent.models import Lead, Company
+from agent.models import Lead
+from agent.records import CompanyTable, LeadRecord, to_leads
 
 class DataGenerator:
+    # Data Pools
+    TITLES_HIGH = ["Director of Toxicology", "Head of Preclinical Safety", "VP Safety Assessment", "Senior Scientist, Hepatic Models", "Principal Investigator, 3D Biology"]
+    TITLES_LOW = ["Junior Researcher", "Lab Technician", "Postdoc Fellow", "Research Assistant", "intern"]
+
+    COMPANIES_HIGH = [
+        {"name": "Vertex Pharma", "hq": "Boston, MA", "funding": "Public", "invitro": True},
+        {"name": "Moderna", "hq": "Cambridge, MA", "funding": "Public", "invitro": True},
+        {"name": "Hepatx Bio", "hq": "San Francisco, CA", "funding": "Series A", "invitro": True},
+        {"name": "LiverChip Inc", "hq": "Basel, Switzerland", "funding": "Series B", "invitro": True},
+    ]
+    COMPANIES_LOW = [
+        {"name": "Generic Chem Corp", "hq": "Austin, TX", "funding": None, "invitro": False},
+        {"name": "OldSchool Meds", "hq": "Chicago, IL", "funding": "Public", "invitro": False},
+        {"name": "Uni Research Lab", "hq": "Columbus, OH", "funding": "Grant", "invitro": False},
+    ]
+
+    LOCATIONS = ["Boston, MA", "Cambridge, MA", "San Francisco, CA", "Remote, TX", "Remote, FL", "London, UK", "Basel, Switzerland", "Denver, CO"]
+    REMOTE_LOCATIONS = ["Remote, TX", "Remote, CO", "Remote, FL"]
+
+    PAPERS = [
+        "Assessment of Drug-Induced Liver Injury using 3D Spheroids",
+        "Novel Organ-on-chip models for Toxicity",
+        "General chemistry related to something else",
+        "Study of lung cells in 2D",
+        "Hepatic toxicity markers in rat models"
+    ]
+    # Good targets publish one of the first two papers, others one of the rest
+    HIGH_PAPERS = 2
+
+    FIRST_NAMES = ["Sarah", "John", "Emily", "Michael", "David", "Jessica", "Robert", "Jennifer"]
+    LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis"]
+
+    # Distribution (shared with agent.bulk_generator)
+    GOOD_TARGET_RATE = 0.2 # approx 20% "Good" leads
+    HIGH_PAPER_RATE = 0.6
+    LOW_PAPER_RATE = 0.1
+    LOW_NAMS_RATE = 0.3
+    HQ_LOCATION_RATE = 0.7
+
     def generate_sample_leads(self, count=500) -> list[Lead]:
+        return to_leads(self.generate_sample_records(count))
+
+    def generate_sample_records(self, count=500) -> list[LeadRecord]:
+        """
+        Same leads as generate_sample_leads, as lightweight records for the
+        hot path. Companies are interned, so leads share a handful of them.
+        """
         leads = []
-        
-        # Data Pools
-        titles_high = ["Director of Toxicology", "Head of Preclinical Safety", "VP Safety Assessment", "Senior Scientist, Hepatic Models", "Principal Investigator, 3D Biology"]
-        titles_low = ["Junior Researcher", "Lab Technician", "Postdoc Fellow", "Research Assistant", "intern"]
-        
-        companies_high = [
-            {"name": "Vertex Pharma", "hq": "Boston, MA", "funding": "Public", "invitro": True},
-            {"name": "Moderna", "hq": "Cambridge, MA", "funding": "Public", "invitro": True},
-            {"name": "Hepatx Bio", "hq": "San Francisco, CA", "funding": "Series A", "invitro": True},
-            {"name": "LiverChip Inc", "hq": "Basel, Switzerland", "funding": "Series B", "invitro": True},
-        ]
-        companies_low = [
-            {"name": "Generic Chem Corp", "hq": "Austin, TX", "funding": None, "invitro": False},
-            {"name": "OldSchool Meds", "hq": "Chicago, IL", "funding": "Public", "invitro": False},
-            {"name": "Uni Research Lab", "hq": "Columbus, OH", "funding": "Grant", "invitro": False},
-        ]
-        
-        locations = ["Boston, MA", "Cambridge, MA", "San Francisco, CA", "Remote, TX", "Remote, FL", "London, UK", "Basel, Switzerland", "Denver, CO"]
-        
-        papers = [
-            "Assessment of Drug-Induced Liver Injury using 3D Spheroids",
-            "Novel Organ-on-chip models for Toxicity",
-            "General chemistry related to something else",
-            "Study of lung cells in 2D",
-            "Hepatic toxicity markers in rat models"
-        ]
+        companies = CompanyTable()
+        papers = self.PAPERS
 
         for _ in range(count):
             # Weigh randomness to ensure we have some "Good" leads (approx 20%)
-            is_good_target = random.random() < 0.2
+            is_good_target = random.random() < self.GOOD_TARGET_RATE
             
             if is_good_target:
-                title = random.choice(titles_high)
-                comp_data = random.choice(companies_high)
-                company = Company(
+                title = random.choice(self.TITLES_HIGH)
+                comp_data = random.choice(self.COMPANIES_HIGH)
+                company = companies.get(
                     name=comp_data["name"],
                     industry="Biotech",
                     location_hq=comp_data["hq"],
@@ -47,31 +70,31 @@ class DataGenerator:
                     uses_invitro_tech=comp_data["invitro"],
                     open_to_nams=True
                 )
-                publications = [random.choice(papers[:2])] if random.random() < 0.6 else [] # 60% chance of paper
+                publications = (random.choice(papers[:self.HIGH_PAPERS]),) if random.random() < self.HIGH_PAPER_RATE else () # 60% chance of paper
             else:
-                title = random.choice(titles_low)
-                comp_data = random.choice(companies_low)
-                company = Company(
+                title = random.choice(self.TITLES_LOW)
+                comp_data = random.choice(self.COMPANIES_LOW)
+                company = companies.get(
                     name=comp_data["name"],
                     industry="Pharma",
                     location_hq=comp_data["hq"],
                     funding_stage=comp_data["funding"],
                     uses_invitro_tech=comp_data["invitro"],
-                    open_to_nams=random.random() < 0.3
+                    open_to_nams=random.random() < self.LOW_NAMS_RATE
                 )
-                publications = [random.choice(papers[2:])] if random.random() < 0.1 else []
+                publications = (random.choice(papers[self.HIGH_PAPERS:]),) if random.random() < self.LOW_PAPER_RATE else ()
 
             # Randomize Person Location logic
-            if "Remote" in random.choice(locations):
-                loc_person = random.choice(["Remote, TX", "Remote, CO", "Remote, FL"])
+            if "Remote" in random.choice(self.LOCATIONS):
+                loc_person = random.choice(self.REMOTE_LOCATIONS)
             else:
                 # Often same as HQ for non-remote
-                loc_person = company.location_hq if random.random() < 0.7 else random.choice(locations)
+                loc_person = company.location_hq if random.random() < self.HQ_LOCATION_RATE else random.choice(self.LOCATIONS)
 
-            first_name = random.choice(["Sarah", "John", "Emily", "Michael", "David", "Jessica", "Robert", "Jennifer"])
-            last_name = random.choice(["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis"])
+            first_name = random.choice(self.FIRST_NAMES)
+            last_name = random.choice(self.LAST_NAMES)
             
-            lead = Lead(
+            lead = LeadRecord(
                 id=str(uuid.uuid4()),
                 name=f"{first_name} {last_name}",
                 title=title,
@@ -0,0 +1,185 @@
+import cProfile
+import json
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator
+
+
+class Instruments:
+    """
+    Per-stage timers and counters for one run. `stage` blocks nest: each
+    records its total time and its self time (total minus nested stages),
+    so a parse stage that pulls bytes through `metered` reports parse time
+    and download time separately. Safe to use from worker threads.
+    """
+
+    enabled = True
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, list] = {}  # name -> [calls, total_s, self_s]
+        self.counters: Dict[str, float] = {}
+        self.notes: Dict[str, object] = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def _record(self, name: str, total: float, nested: float):
+        with self.lock:
+            entry = self.stages.setdefault(name, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += total
+            entry[2] += total - nested
+
+    @contextmanager
+    def stage(self, name: str):
+        # Stack of nested-time accumulators for the stages open on this thread
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            self._record(name, elapsed, nested)
+
+    def count(self, name: str, n: float = 1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def note(self, name: str, value):
+        self.notes[name] = value
+
+    def metered(self, chunks: Iterable[bytes], name: str) -> Iterator[bytes]:
+        """
+        Passes `chunks` through, timing each read as stage `name` and adding
+        the bytes to counter `name + ".bytes"`.
+        """
+        chunks = iter(chunks)
+        while True:
+            with self.stage(name):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            self.count(name + ".bytes", len(chunk))
+            yield chunk
+
+    def _rates(self) -> dict:
+        # A counter "<stage>.<unit>" next to a stage "<stage>" yields units/s
+        # and ms per unit, e.g. extract.leads -> extract.leads_per_s
+        rates = {}
+        for name, count in sorted(self.counters.items()):
+            stage, _, unit = name.rpartition(".")
+            if stage in self.stages and count:
+                total = self.stages[stage][1]
+                rates[f"{name}_per_s"] = round(count / total, 3) if total else None
+                if unit != "bytes":
+                    rates[f"{stage}.ms_per_{unit.rstrip('s')}"] = round(total / count * 1000, 6)
+        return rates
+
+    def report(self) -> dict:
+        stages = {
+            name: {
+                "calls": calls,
+                "total_s": round(total, 6),
+                "self_s": round(self_time, 6),
+                "mean_ms": round(total / calls * 1000, 3),
+            }
+            for name, (calls, total, self_time) in sorted(self.stages.items())
+        }
+        return {
+            "wall_s": round(time.perf_counter() - self.started, 6),
+            "python": platform.python_version(),
+            "stages": stages,
+            "counters": dict(sorted(self.counters.items())),
+            "rates": self._rates(),
+            **self.notes,
+        }
+
+    def write_report(self, path: str):
+        # Imported here: the exporter itself reports through this module
+        from agent.exporter import atomic_write
+        report = self.report()
+        atomic_write(path, lambda f: json.dump(report, f, indent=2), mode="w")
+
+
+class NullInstruments:
+    """
+    Stand-in while instrumentation is off: every call is a no-op, and
+    `metered` hands back the original iterable untouched.
+    """
+
+    enabled = False
+
+    class _NullStage:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    _STAGE = _NullStage()
+
+    def stage(self, name: str):
+        return self._STAGE
+
+    def count(self, name: str, n: float = 1):
+        pass
+
+    def note(self, name: str, value):
+        pass
+
+    def metered(self, chunks: Iterable[bytes], name: str) -> Iterable[bytes]:
+        return chunks
+
+
+_NULL = NullInstruments()
+_active = _NULL
+
+
+def current():
+    """
+    The active instruments, or the shared no-op instance when none are.
+    """
+    return _active
+
+
+def activate() -> Instruments:
+    global _active
+    _active = Instruments()
+    return _active
+
+
+def deactivate():
+    global _active
+    _active = _NULL
+
+
+def profile_run(main: Callable, output_dir: str, name: str = "run"):
+    """
+    Runs `main()` with instrumentation on under cProfile, then writes
+    `<name>.prof` (open with `python -m pstats` or snakeviz) and the JSON
+    run report `<name>_report.json` into `output_dir`. cProfile only sees
+    the calling thread; stage timers cover the worker threads as well.
+    """
+    instruments = activate()
+    instruments.note("profiled", True)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return main()
+    finally:
+        profiler.disable()
+        deactivate()
+        os.makedirs(output_dir, exist_ok=True)
+        profile_path = os.path.join(output_dir, f"{name}.prof")
+        report_path = os.path.join(output_dir, f"{name}_report.json")
+        profiler.dump_stats(profile_path)
+        instruments.write_report(report_path)
+        print(f"\n⏱️ Profile: {profile_path}")
+        print(f"   -> Run report: {report_path}")
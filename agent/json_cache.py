@@ -0,0 +1,76 @@
+import json
+import os
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from agent.exporter import atomic_write
+
+
+class JsonLRUCache:
+    """
+    Bounded LRU map of string keys to tuples, persisted as one JSON file
+    (least recently used first). The file records the rules version it was
+    written under and is ignored on load when that no longer matches, so a
+    rule change never serves stale entries. `decode` rebuilds an entry from
+    its saved fields (a plain tuple by default).
+    """
+
+    def __init__(self, path: Optional[str], max_entries: int, decode: Callable[..., tuple] = None):
+        self.path = path
+        self.max_entries = max_entries
+        self.decode = decode or (lambda *fields: tuple(fields))
+        self.rules_version = None
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, rules_version: str):
+        """
+        Sets the rules version and loads the file if it was written under it.
+        """
+        self.rules_version = rules_version
+        self.entries.clear()
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable cache {self.path}: {e}")
+            return
+        if data.get("rules_version") != rules_version:
+            return
+        for key, *fields in data.get("entries", [])[-self.max_entries:]:
+            self.entries[key] = self.decode(*fields)
+
+    def get(self, key: str) -> Optional[tuple]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: tuple):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """
+        Writes the cache (least recently used first) via exporter.atomic_write.
+        """
+        if not self.path:
+            return
+        data = {
+            "rules_version": self.rules_version,
+            "entries": [[key, *entry] for key, entry in self.entries.items()],
+        }
+        atomic_write(self.path, lambda f: json.dump(data, f), mode="w")
+
+    def stats(self) -> str:
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"{self.hits} hits / {self.misses} misses ({rate:.1f}% reused)"
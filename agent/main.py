@@ -1,40 +1,59 @@
-import json
-import os
+import argparse
+
+from agent import instrumentation
+from agent.exporter import export_run_artifacts
 from agent.generator import DataGenerator
 from agent.ranker import ProbabilityEngine
+from agent.records import to_leads
+from agent.score_cache import ScoreCache
 
-def main():
+def main(breakdown: bool = False):
     print("🚀 Starting LogicLattice Lead Generation Agent...")
+    # Stage timers/counters; a no-op unless run with --profile
+    instruments = instrumentation.current()
     
     # 1. Generate Lead Data (Mock of scraping)
     print("\n[Phase 1] Scanning Professional Networks & Scientific Databases...")
     generator = DataGenerator()
-    leads = generator.generate_sample_leads(count=500)
+    # Lightweight records until export; Pydantic models only at the boundary
+    with instruments.stage("generate"):
+        leads = generator.generate_sample_records(count=500)
+    instruments.count("generate.leads", len(leads))
     print(f"   -> Identified {len(leads)} raw profiles.")
 
     # 2. Score & Rank
     print("\n[Phase 2] Analyzing & Ranking Candidates...")
-    ranker = ProbabilityEngine()
-    ranked_leads = ranker.rank_leads(leads)
+    # Unchanged leads reuse their score from previous runs
+    score_cache = ScoreCache()
+    ranker = ProbabilityEngine(cache=score_cache)
+    with instruments.stage("score"):
+        ranked = ranker.rank_leads(leads)
+    instruments.count("score.leads", len(leads))
+    if breakdown:
+        # Breakdown text is rendered only when asked for; exports otherwise
+        # carry the compact score_mask/score_keys
+        ranker.explain(ranked)
+    ranked_leads = to_leads(ranked)
+    score_cache.save()
+    print(f"   -> Score cache: {score_cache.stats()}")
     
     # 3. Export
     output_file = "dashboard/public/leads_data.json"
     # Also save to agent folder for reference
     backup_file = "agent/leads_ranked.json"
     
-    data = [lead.model_dump() for lead in ranked_leads]
-    
-    # Ensure dir exists in case dashboard not init
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    
-    with open(output_file, "w") as f:
-        json.dump(data, f, indent=2)
-        
-    with open(backup_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # JSON + backup, rules sidecar, search index and the Arrow store
+    export_run_artifacts(ranked_leads, output_file, backup_file, ranker.rules, breakdown=breakdown)
         
     print(f"\n✅ Done! Processed and ranked {len(ranked_leads)} leads.")
     print(f"   -> Saved to: {output_file}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Lead generation from mock data.")
+    parser.add_argument("--profile", action="store_true", help="write a cProfile dump and a JSON run report to agent/")
+    parser.add_argument("--breakdown", action="store_true", help="include score breakdown text in the exports")
+    args = parser.parse_args()
+    if args.profile:
+        instrumentation.profile_run(lambda: main(args.breakdown), "agent", name="run")
+    else:
+        main(args.breakdown)
@@ -1,86 +1,82 @@
-import json
-import os
+import argparse
 import uuid
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
-from agent.models import Lead, Company
+from agent import instrumentation
+from agent.checkpoint import RunJournal
+from agent.company_resolver import CompanyResolver
+from agent.entity_resolution import EntityResolver
+from agent.exporter import export_run_artifacts
+from agent.pipeline import prefetch
 from agent.ranker import ProbabilityEngine
+from agent.records import CompanyTable, LeadRecord, to_leads
+from agent.score_cache import ScoreCache
+from agent.scrapers.pubmed_cache import PubMedCache
 from agent.scrapers.pubmed_scraper import PubMedScraper
-from agent.scrapers.linkedin_discoverer import LinkedInDiscoverer
+from agent.scrapers.linkedin_cache import LinkedInCache
+from agent.scrapers.linkedin_discoverer import LinkedInDiscoverer, linkedin_search_url
 
-def is_industry_affiliation(affiliation: str) -> bool:
+# Configuration
+SKIP_LINKEDIN = True # User prefers not to use LinkedIn
+
+def extract_leads_from_papers(papers: List[dict], max_leads: int = 20) -> List[LeadRecord]:
+    return list(iter_leads_from_papers(papers, max_leads=max_leads))
+
+def iter_leads_from_papers(
+    papers: Iterable[dict],
+    max_leads: int = 20,
+    resolver: Optional[EntityResolver] = None,
+    journal: Optional[RunJournal] = None,
+    companies: Optional[CompanyTable] = None,
+    company_resolver: Optional[CompanyResolver] = None,
+) -> Iterator[LeadRecord]:
     """
-    Simple heuristic to check if an affiliation string looks like a company 
-    rather than just a university/hospital.
+    Lazily turns papers into leads, yielding each new person as soon as they
+    are found. Candidates go through `resolver` (which may carry state over
+    from a resumed run): an author already seen at the same company is merged
+    into the earlier lead, which gains the paper, instead of being yielded
+    again. Merges update yielded leads in place, so score them only after the
+    stream ends. Stops pulling papers once `max_leads` people have been found.
+    With a `journal`, every processed paper and its raw leads are checkpointed.
+    Companies are interned in `companies`, so authors at the same company
+    share one record; affiliations are classified through `company_resolver`.
     """
-    text = affiliation.lower()
-    indicators = [
-        " inc", " ltd", " llc", " gmbh", "pharma", "biotech", 
-        "therapeutics", "biosciences", "laboratories", "technologies",
-        "corp", "company"
-    ]
-    # university/hospital exclusion
-    academic_indicators = ["university", "college", "school of", "hospital", "clinic", "institute", "univ"]
+    found = 0
+    resolver = EntityResolver() if resolver is None else resolver
+    company_resolver = CompanyResolver(path=None) if company_resolver is None else company_resolver
+    companies = CompanyTable() if companies is None else companies
     
-    has_ind = any(i in text for i in indicators)
-    has_acd = any(a in text for a in academic_indicators)
-    
-    # If it has Pharma/Biotech markers, likely industry even if "Institute" is present (e.g. Novartis Institute)
-    strong_ind = ["pharma", "biotech", "therapeutics", "biosciences"]
-    if any(s in text for s in strong_ind):
-        return True
-        
-    return has_ind and not has_acd
 
-def extract_leads_from_papers(papers: List[dict], max_leads: int = 20) -> List[Lead]:
-    leads = []
-    seen_names = set()
-    
-
-    # Configuration
-    SKIP_LINKEDIN = True # User prefers not to use LinkedIn
-    
     for paper in papers:
-        if len(leads) >= max_leads:
+        if found >= max_leads:
             break
             
         title = paper['title']
+        paper_leads = []
         
         # Check authors
         # Usually first and last author are most relevant
         target_indices = [0, -1] if len(paper['authors']) > 1 else [0]
         
+        # Check affiliations (each distinct string is classified once per cache)
+        industry_affs = [a for a in map(company_resolver.resolve, paper['affiliations']) if a.is_industry]
+        
         for idx in target_indices:
             if idx >= len(paper['authors']): continue
             
             author_name = paper['authors'][idx]
-            if author_name in seen_names:
-                continue
-            
-            # Check affiliations
-            industry_affs = [aff for aff in paper['affiliations'] if is_industry_affiliation(aff)]
             
             if industry_affs:
                 # Found a potential lead!
-                company_name_raw = industry_affs[0].split(',')[0].strip() # Take first part like "Vertex Pharma"
-                # Clean up company name roughly
-                company_name = company_name_raw.replace('.', '')
+                company_name = industry_affs[0].company # First part like "Vertex Pharma"
                 
                 print(f"🎯 Candidate: {author_name} @ {company_name}")
                 
-                linkedin_url = ""
-                if not SKIP_LINKEDIN:
-                     # Try to find LinkedIn
-                    found_url = discoverer.find_profile(author_name, company=company_name)
-                    if found_url:
-                        linkedin_url = found_url.replace("https://", "").replace("http://", "")
-                    
-                if not linkedin_url:
-                    # Fallback: Generate a Search URL so the button works
-                    # This lets the user find them with 1 click without us scraping
-                    encoded_name = author_name.replace(" ", "%20")
-                    # User requested to search ONLY by name as company search was failing
-                    linkedin_url = f"www.linkedin.com/search/results/all/?keywords={encoded_name}"
+                # Fallback: Generate a Search URL so the button works
+                # This lets the user find them with 1 click without us scraping.
+                # Real profiles are looked up in one batch after resolution (enrich_linkedin)
+                # User requested to search ONLY by name as company search was failing
+                linkedin_url = linkedin_search_url(author_name)
 
                 # Extract Location from Affiliation
                 location = "Unknown"
@@ -90,7 +86,7 @@ def extract_leads_from_papers(papers: List[dict], max_leads: int = 20) -> List[L
                     location = paper['affiliations'][0]
 
                 # Create Objects (Even if no LinkedIn, we have the Author + Company + Paper signal)
-                comp = Company(
+                comp = companies.get(
                     name=company_name,
                     industry="Biotech/Pharma",
                     location_hq=location, 
@@ -100,17 +96,16 @@ def extract_leads_from_papers(papers: List[dict], max_leads: int = 20) -> List[L
                 )
                 
                 # Try to get an email
-                # If we scraped emails from the paper, use one. 
-                # Since we can't easily map exact author to email in this simple scraper, 
-                # we will use an email if it looks like it matches the company domain, or just default to Unavailable.
+                # Prefer the email found in this author's own affiliation; otherwise
+                # fall back to any email scraped from the paper, or Unavailable.
                 
-                email = "Unavailable"
-                if paper.get('emails'):
+                email = paper.get('author_emails', {}).get(author_name, "Unavailable")
+                if email == "Unavailable" and paper.get('emails'):
                     # Pick the first one for now, or "Unavailable"
                     # Ideally we check if email domain matches company name
                     email = paper['emails'][0] 
                 
-                lead = Lead(
+                lead = LeadRecord(
                     id=str(uuid.uuid4()),
                     name=author_name,
                     title="Researcher / Scientist", 
@@ -118,87 +113,145 @@ def extract_leads_from_papers(papers: List[dict], max_leads: int = 20) -> List[L
                     location_person=location,
                     email=email,
                     linkedin_url=linkedin_url,
-                    publications=[title]
+                    publications=(title,)
                 )
                 
-                leads.append(lead)
-                seen_names.add(author_name)
+                paper_leads.append(lead)
+                entity, is_new = resolver.add(lead)
+                if not is_new:
+                    print(f"   🔗 Merged into existing lead: {entity.name}")
+                    continue
+                
+                found += 1
                 print(f"   ✅ Added Lead: {author_name}")
+                yield entity
                     
-            if len(leads) >= max_leads:
+            if found >= max_leads:
                 break
                 
-    return leads
+        if journal is not None and paper.get('pmid'):
+            journal.record_paper(paper['pmid'], paper_leads)
+
+def enrich_linkedin(leads: List[LeadRecord], discoverer: LinkedInDiscoverer):
+    """
+    Replaces the search-URL fallback with real profile URLs where found.
+    All leads go out as one concurrent, rate-limited batch; each distinct
+    (name, company) is searched at most once and cached results are reused.
+    """
+    profiles = discoverer.find_profiles((lead.name, lead.company.name) for lead in leads)
+    for lead in leads:
+        url = profiles[(lead.name, lead.company.name)]
+        if url:
+            lead.linkedin_url = url.replace("https://", "").replace("http://", "")
 
-def main():
+def main(breakdown: bool = False):
     print("🚀 Starting Real Data Lead Generation Agent...")
+    # Stage timers/counters; a no-op unless run with --profile
+    instruments = instrumentation.current()
     
     # 1. PubMed Search
-    pubmed = PubMedScraper()
+    # Cached articles and recent searches are served from disk instead of NCBI
+    pubmed_cache = PubMedCache()
+    pubmed = PubMedScraper(cache=pubmed_cache)
     keywords = ["3D cell culture", "Organ-on-chip", "Liver spheroids", "Drug-Induced Liver Injury"]
     
+    # The phases below are chained generators: papers stream out of PubMed on a
+    # background thread (several efetch chunks in flight, bounded queue =
+    # backpressure) and leads are extracted
+    # and de-duplicated as they arrive. Ranking is not part of the stream: a
+    # later paper can still merge into any earlier lead, so scoring starts
+    # only once extraction and entity resolution have finished.
     print("\n[Phase 1] Scouring Scientific Literature (PubMed)...")
-    papers = pubmed.get_leads_from_papers(keywords, limit=2000)
+    pmids = pubmed.search_articles(keywords, max_results=2000)
+    
+    # Resume: papers checkpointed by an interrupted run of the same search are
+    # not fetched again; their leads are replayed from the journal instead
+    journal = RunJournal("agent/.cache/run_journal.ndjson", run_key={"keywords": keywords, "limit": 2000, "max_leads": 2000})
+    companies = CompanyTable()
+    done_pmids, resumed_leads = journal.load(companies)
+    # Entity resolution: one lead per person, replaying resumed raw leads first
+    resolver = EntityResolver()
+    resolver.resolve(resumed_leads)
+    resumed_count = len(resolver.entities)
+    if done_pmids:
+        print(f"Resuming: {len(done_pmids)} papers / {len(resolver.entities)} leads restored from checkpoint.")
+    pmids = [pmid for pmid in pmids if pmid not in done_pmids]
+    
+    print(f"Found {len(pmids)} articles to process. Streaming details...")
+    papers = prefetch(pubmed.iter_details(pmids), maxsize=500)
     
     # 2. Extract & Enrich
     print("\n[Phase 2] Identifying Corporate Authors & LinkedIn Profiles...")
-    leads = extract_leads_from_papers(papers, max_leads=2000) # Extract ALL candidates (up to 2000)
+    # Affiliation -> (is_industry, company, company key), remembered across runs
+    company_resolver = CompanyResolver()
+    new_leads = iter_leads_from_papers(
+        papers,
+        max_leads=2000 - len(resolver.entities), # Extract ALL candidates (up to 2000)
+        resolver=resolver,
+        journal=journal,
+        companies=companies,
+        company_resolver=company_resolver,
+    )
+    # Drain the stream; the resolver collects every distinct person
+    # (the extract stage includes waiting on PubMed for the next paper)
+    with instruments.stage("extract"):
+        for _ in new_leads:
+            pass
+    papers.close()
+    leads = resolver.entities
+    instruments.count("extract.leads", len(leads) - resumed_count)
+    instruments.count("extract.merges", resolver.merged)
+    company_resolver.save()
+    print(f"   -> PubMed cache: {pubmed_cache.stats()}")
+    print(f"   -> Company cache: {company_resolver.stats()}")
+    print(f"   -> Entity resolution: {resolver.stats()}")
+    
+    if not SKIP_LINKEDIN:
+        linkedin_cache = LinkedInCache()
+        with instruments.stage("linkedin"):
+            enrich_linkedin(leads, LinkedInDiscoverer(cache=linkedin_cache))
+        print(f"   -> LinkedIn cache: {linkedin_cache.stats()}")
+        linkedin_cache.close()
     
     # 3. Rank
     print("\n[Phase 3] Ranking Leads...")
-    ranker = ProbabilityEngine()
-    ranked_leads = ranker.rank_leads(leads)
+    # Unchanged leads reuse their score from previous runs
+    score_cache = ScoreCache()
+    ranker = ProbabilityEngine(cache=score_cache)
     
     # Stratified Sampling: User wants to see range (100+ from each tier)
-    tiers = {"Highest": [], "High": [], "Medium": [], "Low": []}
-    for lead in ranked_leads:
-        if lead.rank_tier in tiers:
-            tiers[lead.rank_tier].append(lead)
-            
-    final_leads = []
-    # Try to pick 125 from each tier to get ~500 diverse leads
-    target_per_tier = 125
-    
-    # Track which leads are added to avoid duplicates if we backfill
-    added_ids = set()
-    
-    for tier_name in ["Highest", "High", "Medium", "Low"]:
-        candidates = tiers[tier_name]
-        # Sort by score within tier just in case
-        candidates.sort(key=lambda x: x.score, reverse=True)
-        
-        selection = candidates[:target_per_tier]
-        final_leads.extend(selection)
-        for l in selection:
-            added_ids.add(l.id)
-            
-    # If we have shortage (e.g. not enough Low tier), fill up with best remaining leads
-    if len(final_leads) < 500:
-        remaining = [l for l in ranked_leads if l.id not in added_ids]
-        needed = 500 - len(final_leads)
-        final_leads.extend(remaining[:needed])
-        
-    # Final Sort
-    final_leads.sort(key=lambda x: x.score, reverse=True)
-    ranked_leads = final_leads[:500]
+    # Try to pick 125 from each tier to get ~500 diverse leads, backfilled with the best remaining
+    # Records stay lightweight through ranking; only the selection becomes Pydantic Leads.
+    # `leads` is the fully resolved set, so every lead is scored in its final form.
+    with instruments.stage("score"):
+        selected = ranker.select_stratified(leads, per_tier=125, total=500)
+    instruments.count("score.leads", len(leads))
+    if breakdown:
+        # Breakdown text is rendered only when asked for; exports otherwise
+        # carry the compact score_mask/score_keys
+        ranker.explain(selected)
+    ranked_leads = to_leads(selected)
+    score_cache.save()
+    print(f"   -> Score cache: {score_cache.stats()}")
     
     # 4. Save
     output_file = "dashboard/public/leads_data.json"
     # Also save to agent folder for reference
     backup_file = "agent/leads_ranked.json"
     
-    data = [lead.model_dump() for lead in ranked_leads]
-    
-    # Ensure dir exists
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    
-    with open(output_file, "w") as f:
-        json.dump(data, f, indent=2)
-        
-    with open(backup_file, "w") as f:
-        json.dump(data, f, indent=2)
+    # JSON + backup, rules sidecar, search index and the Arrow store
+    export_run_artifacts(ranked_leads, output_file, backup_file, ranker.rules, breakdown=breakdown)
         
+    journal.complete()
+    
     print(f"\n✅ Done! Generated {len(ranked_leads)} REAL leads saved to {output_file}")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Lead generation from real PubMed data.")
+    parser.add_argument("--profile", action="store_true", help="write a cProfile dump and a JSON run report to agent/")
+    parser.add_argument("--breakdown", action="store_true", help="include score breakdown text in the exports")
+    args = parser.parse_args()
+    if args.profile:
+        instrumentation.profile_run(lambda: main(args.breakdown), "agent", name="run_real")
+    else:
+        main(args.breakdown)
@@ -0,0 +1,69 @@
+import re
+from typing import Iterable, Optional
+
+
+class KeywordMatcher:
+    """
+    Finds the first keyword (in list order) contained in a piece of text.
+
+    All keywords are compiled into a single alternation regex. At any position
+    the regex picks the earliest-listed keyword that starts there, and the scan
+    resumes one character after each match start, so overlapping keywords are
+    never skipped. Results are memoized per text because titles, company names
+    and locations repeat heavily across leads.
+    """
+
+    def __init__(self, keywords: Iterable[str], memo_size: int = 100_000):
+        self.keywords = list(keywords)
+        self.memo_size = memo_size
+        self._index = {}
+        for i, k in enumerate(self.keywords):
+            self._index.setdefault(k, i)
+        alternation = "|".join(re.escape(k) for k in self.keywords)
+        self._search = re.compile(alternation).search if self.keywords else None
+        self._memo = {}
+
+    def _scan(self, text: str) -> int:
+        best = -1
+        pos = 0
+        m = self._search(text)
+        while m is not None:
+            i = self._index[m.group()]
+            if best < 0 or i < best:
+                best = i
+                if best == 0:
+                    break
+            pos = m.start() + 1
+            # An empty keyword matches at len(text) too; stop past the end
+            if pos > len(text):
+                break
+            m = self._search(text, pos)
+        return best
+
+    def first_index(self, *texts: str) -> int:
+        """
+        Returns the list index of the first keyword found in any of `texts`, or -1.
+        Texts are expected to be lowercased already.
+        """
+        if self._search is None:
+            return -1
+
+        best = -1
+        memo = self._memo
+        for text in texts:
+            i = memo.get(text)
+            if i is None:
+                i = self._scan(text)
+                if len(memo) >= self.memo_size:
+                    memo.clear()
+                memo[text] = i
+            if i >= 0 and (best < 0 or i < best):
+                best = i
+        return best
+
+    def first(self, *texts: str) -> Optional[str]:
+        """
+        Returns the first keyword (in list order) found in any of `texts`, or None.
+        """
+        i = self.first_index(*texts)
+        return self.keywords[i] if i >= 0 else None
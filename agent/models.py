@@ -24,6 +24,10 @@ class Lead(BaseModel):
     
     # Output fields
     score: float = 0.0
+    # Matched rules (bitmask) and their packed keyword IDs; see agent/scoring_rules.py
+    score_mask: int = 0
+    score_keys: int = 0
+    # Rendered from score_mask/score_keys only on request (ScoringRules.explain)
     score_breakdown: List[str] = []
     rank_tier: str = "Low" # Low, Medium, High, Very High
 
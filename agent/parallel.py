@@ -0,0 +1,54 @@
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from agent.batch import LeadBatch, scoring_row
+from agent.models import Lead
+
+# Per-process engine, built once by the pool initializer
+_worker_engine = None
+
+
+def _init_worker(engine_cls, rules_spec):
+    global _worker_engine
+    _worker_engine = engine_cls(rules=rules_spec)
+
+
+def _score_shard(shard: tuple) -> list[tuple]:
+    """
+    Scores one shard and returns it as a sorted run of
+    (seq, score, rank_tier, score_mask, score_keys) rows, best first.
+    """
+    start, rows = shard
+    batch = LeadBatch.from_rows(rows)
+    result = _worker_engine.rank_batch(batch)
+    return [
+        (start + int(i), result.score[i].item(), result.rank_tier[i], int(result.score_mask[i]), int(result.score_keys[i]))
+        for i in result.order
+    ]
+
+
+def rank_leads_parallel(engine, leads: list[Lead], workers: int = None, shard_size: int = 50_000) -> list[Lead]:
+    """
+    Shards `leads` across a process pool, scores each shard in a worker and
+    k-way merges the per-shard sorted runs. Output matches rank_leads.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = [
+        (start, [scoring_row(lead) for lead in leads[start:start + shard_size]])
+        for start in range(0, len(leads), shard_size)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(type(engine), engine.rules.spec)) as pool:
+        runs = list(pool.map(_score_shard, shards))
+
+    ranked = []
+    # Runs are each ordered by (-score, seq); merging on the same key keeps the stable order
+    for seq, score, tier, mask, keys in heapq.merge(*runs, key=lambda row: (-row[1], row[0])):
+        lead = leads[seq]
+        lead.score = score
+        lead.rank_tier = tier
+        lead.score_mask = mask
+        lead.score_keys = keys
+        ranked.append(lead)
+    return ranked
@@ -0,0 +1,67 @@
+import queue
+import threading
+from typing import Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+_ERROR = object()
+
+
+def prefetch(items: Iterable[T], maxsize: int = 256) -> Iterator[T]:
+    """
+    Runs a (network-bound) iterable in a background thread and hands its items
+    over through a bounded queue. The producer blocks once `maxsize` items are
+    waiting, so a slow consumer applies backpressure instead of letting
+    fetched records pile up. Producer errors are re-raised in the consumer.
+    When the consumer stops early (close, an exception, KeyboardInterrupt),
+    the producer is stopped, the source iterator is closed on the producer
+    thread (running its cleanup, e.g. shutting down a fetch pool) and the
+    thread is joined.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        source = iter(items)
+        try:
+            for item in source:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as e:
+            put((_ERROR, e))
+        finally:
+            # A generator can only be closed from the thread that runs it
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if type(item) is tuple and len(item) == 2 and item[0] is _ERROR:
+                raise item[1]
+            yield item
+    finally:
+        stop.set()
+        # Drop whatever is queued so a producer blocked in put() sees the stop
+        while True:
+            try:
+                buffer.get_nowait()
+            except queue.Empty:
+                break
+        thread.join()
@@ -0,0 +1,255 @@
+import argparse
+import bisect
+import csv
+import io
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from agent.scoring_rules import ScoringRules, load_export_rules, load_rules
+from agent.search_index import SearchIndex, index_path_for, tokenize
+
+SORT_FIELDS = {
+    "score": lambda lead: lead["score"],
+    "name": lambda lead: lead["name"].lower(),
+    "title": lambda lead: lead["title"].lower(),
+    "company.name": lambda lead: lead["company"]["name"].lower(),
+}
+CSV_HEADERS = ["Rank", "Probability", "Name", "Title", "Company", "Location HQ", "Email", "LinkedIn"]
+
+
+class LeadIndex:
+    """
+    Read-only indexes over an exported leads file, built once per file version.
+    Leads are stored in score-descending order, so a lead's position doubles
+    as its score rank:
+    - neg_scores: negated scores, for a binary-search min-score cut-off
+    - tier_codes: rank tier per position
+    - search: the export's inverted text index (agent/search_index.py),
+      loaded from disk when present, whose document IDs are file order
+    - sort orders for the other sortable columns, computed on first use
+    - rules: the scoring rules saved with the export, to render breakdowns
+    """
+
+    def __init__(self, leads: List[dict], search: Optional[SearchIndex] = None, rules: Optional[ScoringRules] = None):
+        # Stable, so equal scores keep file order
+        order = sorted(range(len(leads)), key=lambda i: leads[i]["score"], reverse=True)
+        self.leads = [leads[i] for i in order]
+        self.neg_scores = [-lead["score"] for lead in self.leads]
+        # File position (search document ID) -> score position
+        self.doc_pos = np.empty(len(order), dtype=np.int64)
+        self.doc_pos[order] = np.arange(len(order))
+
+        self.tier_ids: Dict[str, int] = {}
+        self.tier_codes = np.array(
+            [self.tier_ids.setdefault(lead["rank_tier"], len(self.tier_ids)) for lead in self.leads],
+            dtype=np.int16,
+        )
+        self.search = search if search is not None else SearchIndex.build(leads)
+        self.rules = rules if rules is not None else load_rules()
+        self._sort_ranks: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path: str) -> "LeadIndex":
+        with open(path, "r") as f:
+            data = json.load(f)
+        # The JSON file is a direct array of leads
+        leads = data if isinstance(data, list) else data.get("leads", [])
+        return cls(leads, SearchIndex.load_or_build(index_path_for(path), leads), load_export_rules(path))
+
+    def explain(self, lead: dict) -> dict:
+        """
+        A copy of `lead` with score_breakdown rendered from its score_mask.
+        """
+        if "score_mask" not in lead:
+            return lead
+        return {**lead, "score_breakdown": list(self.rules.render(lead["score_mask"], lead["score_keys"]))}
+
+    def _sort_rank(self, key: str) -> np.ndarray:
+        # Position -> rank under `key` ascending, computed once per key
+        with self._lock:
+            if key not in self._sort_ranks:
+                order = sorted(range(len(self.leads)), key=lambda pos: SORT_FIELDS[key](self.leads[pos]))
+                ranks = np.empty(len(order), dtype=np.int64)
+                ranks[order] = np.arange(len(order))
+                self._sort_ranks[key] = ranks
+            return self._sort_ranks[key]
+
+    def query(
+        self,
+        min_score: Optional[float] = None,
+        tier: Optional[str] = None,
+        q: str = "",
+        sort: str = "score",
+        order: str = "desc",
+    ) -> np.ndarray:
+        """
+        Returns matching lead positions in the requested order. The last query
+        token is matched as a prefix so results update while typing. Besides
+        SORT_FIELDS, `sort="relevance"` orders text matches by how well they
+        match (field-weighted), best first.
+        """
+        if sort not in SORT_FIELDS and sort != "relevance":
+            raise ValueError(f"Unsupported sort field '{sort}'")
+
+        # Score cut-off: leads are score-descending, so matches are a prefix
+        limit = len(self.leads)
+        if min_score is not None:
+            limit = bisect.bisect_right(self.neg_scores, -min_score)
+
+        if tokenize(q):
+            docs, _ = self.search.search(q)
+            positions = self.doc_pos[docs]
+        else:
+            positions = np.arange(len(self.leads))
+
+        keep = positions < limit
+        if tier:
+            keep &= self.tier_codes[positions] == self.tier_ids.get(tier, -1)
+        positions = positions[keep]
+
+        if sort == "relevance":
+            # Search results are already best-first; without a query that is score order
+            return positions if order == "desc" else positions[::-1]
+        if sort == "score":
+            positions = np.sort(positions)
+            return positions if order == "desc" else positions[::-1]
+        positions = positions[np.argsort(self._sort_rank(sort)[positions], kind="stable")]
+        return positions[::-1] if order == "desc" else positions
+
+
+class LeadStore:
+    """
+    Holds the LeadIndex for a leads file and rebuilds it when the file changes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.mtime = None
+        self.index = None
+        self.lock = threading.Lock()
+
+    def get(self) -> LeadIndex:
+        mtime = os.path.getmtime(self.path)
+        with self.lock:
+            if self.index is None or mtime != self.mtime:
+                self.index = LeadIndex.from_file(self.path)
+                self.mtime = mtime
+            return self.index
+
+
+def _csv_row(lead: dict) -> list:
+    return [
+        lead["rank_tier"],
+        f"{lead['score']}%",
+        lead["name"],
+        lead["title"],
+        lead["company"]["name"],
+        lead["company"]["location_hq"],
+        lead["email"],
+        f"https://{lead['linkedin_url']}",
+    ]
+
+
+def make_handler(store: LeadStore):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _query_args(self, params: dict) -> dict:
+            get = lambda name, default=None: params.get(name, [default])[0]
+            min_score = get("min_score")
+            return {
+                "min_score": float(min_score) if min_score not in (None, "") else None,
+                "tier": get("tier") or None,
+                "q": get("q", ""),
+                "sort": get("sort", "score"),
+                "order": get("order", "desc"),
+            }
+
+        def _send_json(self, status: int, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Access-Control-Allow-Origin", "*")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = parse_qs(url.query)
+            try:
+                page = max(int(params.get("page", ["1"])[0]), 1)
+                page_size = min(max(int(params.get("page_size", ["50"])[0]), 1), 1000)
+                index = store.get()
+                positions = index.query(**self._query_args(params))
+            except (ValueError, KeyError) as e:
+                return self._send_json(400, {"error": str(e)})
+            except OSError as e:
+                return self._send_json(503, {"error": f"Leads file unavailable: {e}"})
+
+            if url.path == "/leads":
+                start = (page - 1) * page_size
+                leads = [index.leads[p] for p in positions[start:start + page_size]]
+                # Breakdown text is rendered per page, only when asked for
+                if params.get("breakdown", ["0"])[0] not in ("0", "false", ""):
+                    leads = [index.explain(lead) for lead in leads]
+                return self._send_json(200, {
+                    "total": len(positions),
+                    "page": page,
+                    "page_size": page_size,
+                    "leads": leads,
+                })
+
+            if url.path == "/leads.csv":
+                # Streamed: rows are written in batches, never built as one string
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Disposition", 'attachment; filename="lead_lattice_export.csv"')
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerow(CSV_HEADERS)
+                for i, pos in enumerate(positions, 1):
+                    writer.writerow(_csv_row(index.leads[pos]))
+                    if i % 1000 == 0:
+                        self.wfile.write(buffer.getvalue().encode())
+                        buffer.seek(0)
+                        buffer.truncate()
+                self.wfile.write(buffer.getvalue().encode())
+                return
+
+            self._send_json(404, {"error": "Not found"})
+
+    return QueryHandler
+
+
+def serve(path: str, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    return ThreadingHTTPServer((host, port), make_handler(LeadStore(path)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paged lead query API over an exported leads file.")
+    parser.add_argument("--file", default="dashboard/public/leads_data.json")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    server = serve(args.file, args.host, args.port)
+    print(f"🔎 Serving {args.file} on http://{args.host}:{args.port}/leads")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,140 @@
-from agent.models import Lead
+import heapq
+from typing import Iterable, Union
+
+from agent.batch import BatchResult, LeadBatch, score_batch
+from agent.records import LeadLike
+from agent.parallel import rank_leads_parallel
+from agent.score_cache import ScoreCache
+from agent.scoring_rules import ScoringRules
 
 class ProbabilityEngine:
-    def rank_leads(self, leads: list[Lead]) -> list[Lead]:
+    """
+    Scores and ranks leads with declarative rules (agent/scoring_rules.json
+    by default), compiled once per engine into a ScoringRules evaluator.
+    """
+
+    def __init__(self, cache: ScoreCache = None, rules: Union[None, str, dict, ScoringRules] = None):
+        # Rule file path, spec dict or compiled rules; None = the default rule file
+        self.rules = ScoringRules.coerce(rules)
+
+        # Hash of the rule set: changing any weight, keyword or cutoff
+        # invalidates persisted score caches
+        self.rules_version = self.rules.rules_hash
+        self.cache = cache
+        if cache is not None:
+            cache.bind(self.rules_version)
+
+    def rank_leads(self, leads: list[LeadLike]) -> list[LeadLike]:
         """
         Applies scoring logic to a list of leads and sorts them by score descending.
         """
         for lead in leads:
-            self._calculate_score(lead)
+            self._score(lead)
         
         # Sort by score descending
         return sorted(leads, key=lambda x: x.score, reverse=True)
 
-    def _calculate_score(self, lead: Lead):
-        score = 0
-        breakdown = []
+    def rank_leads_parallel(self, leads: list[LeadLike], workers: int = None, shard_size: int = 50_000) -> list[LeadLike]:
+        """
+        Same result as rank_leads, but shards scoring across `workers` processes
+        (default: one per CPU). Only pays off for large inputs; see
+        benchmarks/bench_parallel.py for the crossover point.
+        """
+        return rank_leads_parallel(self, leads, workers=workers, shard_size=shard_size)
 
-        # 1. Role Fit (+30)
-        # Criteria: Title contains Toxicology, Safety, Hepatic, 3D
-        # We also check the Company Name (Department)
-        role_keywords = ["toxicology", "safety", "hepatic", "3d", "liver", "preclinical", "discovery", "researcher", "scientist"]
-        text_to_check = (lead.title + " " + lead.company.name).lower()
-        
-        if any(k in text_to_check for k in role_keywords):
-            score += 30
-            match = next(k for k in role_keywords if k in text_to_check)
-            breakdown.append(f"Role Fit (+30): Found '{match}'")
-
-        # 2. Company Intent (+20)
-        # Criteria: Recently raised Series A/B
-        if lead.company.funding_stage in ["Series A", "Series B"]:
-            score += 20
-            breakdown.append(f"Company Intent (+20): Funding match '{lead.company.funding_stage}'")
-        
-        # 3. Technographic (+15 & +10)
-        # Uses similar tech (+15)
-        if lead.company.uses_invitro_tech:
-            score += 15
-            breakdown.append("Technographic (+15): Uses in-vitro tech")
-        # Open to NAMs (+10)
-        if lead.company.open_to_nams:
-            score += 10
-            breakdown.append("Technographic (+10): Open to NAMs")
-
-        # 4. Location (+10)
-        # Hubs: Boston, Cambridge, Bay Area, Basel, UK Golden Triangle + Intl
-        hubs = [
-            "boston", "cambridge", "bay area", "basel", "uk", "london", "oxford", "golden triangle", "san francisco", 
-            "switzerland", "germany", "usa", "china", "japan", "new york", "san diego", "shanghai", "beijing", "tokyo"
-        ]
-        # Check both person location and HQ
-        person_loc = lead.location_person.lower()
-        hq_loc = lead.company.location_hq.lower()
-        
-        if any(h in person_loc for h in hubs) or any(h in hq_loc for h in hubs):
-            score += 10
-            match = next((h for h in hubs if h in person_loc or h in hq_loc), "Hub")
-            breakdown.append(f"Location (+10): In Hub '{match}'")
-
-        # 5. Scientific Intent (+40)
-        # Paper on DILI in last 2 years (simulated by keyword presence in publications)
-        scientific_keywords = [
-            "drug-induced liver injury", "dili", "liver toxicity", "hepatotoxicity", 
-            "hepatic spheroids", "organ-on-chip", "3d cell culture", "spheroid", "microphysiological"
-        ]
-        has_paper = False
-        for paper in lead.publications:
-            paper_lower = paper.lower()
-            if any(k in paper_lower for k in scientific_keywords):
-                has_paper = True
-                match = next(k for k in scientific_keywords if k in paper_lower)
-                breakdown.append(f"Scientific Intent (+40): Published on '{match}'")
-                score += 40
-                break 
-        
-        # Cap score at 100
-        lead.score = min(score, 100)
-        lead.score_breakdown = breakdown
-        
-        # Assign Tier
-        if lead.score >= 80:
-            lead.rank_tier = "Highest"
-        elif lead.score >= 60:
-            lead.rank_tier = "High"
-        elif lead.score >= 40:
-            lead.rank_tier = "Medium"
-        else:
-            lead.rank_tier = "Low"
-            
+    def top_k(self, leads: Iterable[LeadLike], k: int) -> list[LeadLike]:
+        """
+        Scores leads as they stream in and returns the best `k`, ranked exactly
+        like rank_leads(leads)[:k]. Keeps a bounded heap, so `leads` can be a
+        generator of any length: O(k) memory, O(n log k) time.
+        """
+        heap = []
+        for seq, lead in enumerate(leads):
+            self._score(lead)
+            _push_bounded(heap, k, (lead.score, -seq, lead))
+        return _drain(heap)
+
+    def select_stratified(self, leads: Iterable[LeadLike], per_tier: int, total: int) -> list[LeadLike]:
+        """
+        Streaming stratified sample: the best `per_tier` leads of each rank_tier,
+        backfilled with the best remaining leads up to `total`, ranked by score.
+        One pass with bounded heaps, so memory is O(total) regardless of input size.
+        Each lead is scored once as it arrives, so pass leads that will not
+        change afterwards (main_real passes the entity-resolved set).
+        """
+        tier_heaps = {tier: [] for tier in self.rules.tiers}
+        overall = []  # Best `total` leads overall; always contains the backfill candidates
+        for seq, lead in enumerate(leads):
+            self._score(lead)
+            entry = (lead.score, -seq, lead)
+            if lead.rank_tier in tier_heaps:
+                _push_bounded(tier_heaps[lead.rank_tier], per_tier, entry)
+            _push_bounded(overall, total, entry)
+
+        selected = [entry for heap in tier_heaps.values() for entry in heap]
+        selected_seqs = {entry[1] for entry in selected}
+
+        # If we have shortage (e.g. not enough Low tier), fill up with best remaining leads
+        needed = total - len(selected)
+        if needed > 0:
+            remaining = heapq.nlargest(needed, (e for e in overall if e[1] not in selected_seqs), key=lambda e: e[:2])
+            selected.extend(remaining)
+
+        return _drain(selected)[:total]
+
+    def rank_batch(self, batch: LeadBatch, leads: list[LeadLike] = None) -> BatchResult:
+        """
+        Vectorized scoring over a columnar LeadBatch. Returns score, tier and
+        breakdown arrays plus the ranked row order, identical to rank_leads.
+        Pass the source `leads` to also have the results written onto them
+        (use BatchResult.apply_to to get them back in ranked order).
+        """
+        result = score_batch(self, batch)
+        if leads is not None:
+            result.apply_to(leads)
+        return result
+
+    def _score(self, lead: LeadLike):
+        """
+        Scores a lead, reusing the cached result when its scoring inputs are unchanged.
+        """
+        if self.cache is None:
+            return self._calculate_score(lead)
+
+        key = self.cache.key_for(lead)
+        cached = self.cache.get(key)
+        if cached is not None:
+            lead.score, lead.score_mask, lead.score_keys, lead.rank_tier = cached
+            return lead.score
+
+        self._calculate_score(lead)
+        self.cache.put(key, (lead.score, lead.score_mask, lead.score_keys, lead.rank_tier))
         return lead.score
+
+    def _calculate_score(self, lead: LeadLike):
+        return self.rules.score(lead)
+
+    def explain(self, leads: Iterable[LeadLike]) -> Iterable[LeadLike]:
+        """
+        Renders score_breakdown text for already-scored leads. Scoring only
+        records which rules matched; call this where the text is shown.
+        """
+        return self.rules.explain(leads)
+
+    def tier_for(self, score) -> str:
+        return self.rules.tier_for(score)
+
+
+def _push_bounded(heap: list, size: int, entry: tuple):
+    # Min-heap keyed on (score, -seq): the root is the weakest lead kept so far,
+    # and earlier leads win ties, matching the stable sort in rank_leads
+    if size <= 0:
+        return
+    if len(heap) < size:
+        heapq.heappush(heap, entry)
+    elif entry > heap[0]:
+        heapq.heapreplace(heap, entry)
+
+
+def _drain(entries: list) -> list[LeadLike]:
+    return [lead for _, _, lead in sorted(entries, key=lambda e: e[:2], reverse=True)]
@@ -0,0 +1,174 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from agent.models import Company, Lead
+
+
+@dataclass(frozen=True, slots=True)
+class CompanyRecord:
+    """
+    Immutable company attributes. Leads at the same company share one
+    instance (see CompanyTable), so a company costs memory once per run
+    rather than once per lead.
+    """
+    name: str
+    industry: str
+    location_hq: str
+    funding_stage: Optional[str] = None
+    uses_invitro_tech: bool = False
+    open_to_nams: bool = False
+
+    def to_model(self) -> Company:
+        return Company.model_construct(
+            name=self.name,
+            industry=self.industry,
+            location_hq=self.location_hq,
+            funding_stage=self.funding_stage,
+            uses_invitro_tech=self.uses_invitro_tech,
+            open_to_nams=self.open_to_nams,
+        )
+
+
+class CompanyTable:
+    """
+    Interns CompanyRecords: equal attributes always return the same instance.
+    """
+
+    def __init__(self):
+        self.companies: Dict[tuple, CompanyRecord] = {}
+
+    def get(
+        self,
+        name: str,
+        industry: str,
+        location_hq: str,
+        funding_stage: Optional[str] = None,
+        uses_invitro_tech: bool = False,
+        open_to_nams: bool = False,
+    ) -> CompanyRecord:
+        key = (name, industry, location_hq, funding_stage, uses_invitro_tech, open_to_nams)
+        company = self.companies.get(key)
+        if company is None:
+            company = self.companies[key] = CompanyRecord(*key)
+        return company
+
+    def __len__(self):
+        return len(self.companies)
+
+
+@dataclass(slots=True)
+class LeadRecord:
+    """
+    Lightweight lead used on the hot path (generation, extraction, ranking).
+    Field names match agent.models.Lead, so ProbabilityEngine scores either;
+    no validation happens on construction. Convert with to_model() / to_leads()
+    at the API and export boundary.
+    """
+    id: str
+    name: str
+    title: str
+    company: CompanyRecord
+    location_person: str
+    email: str
+    linkedin_url: str
+    phone: Optional[str] = None
+    publications: Tuple[str, ...] = ()
+
+    score: float = 0.0
+    score_mask: int = 0
+    score_keys: int = 0
+    # Rendered on request only; the shared empty tuple costs nothing per lead
+    score_breakdown: Sequence[str] = ()
+    rank_tier: str = "Low"
+
+    def to_model(self, companies: Optional[Dict[CompanyRecord, Company]] = None) -> Lead:
+        """
+        The equivalent Lead. Passing a shared `companies` dict converts each
+        interned company only once across many leads.
+        """
+        if companies is None:
+            company = self.company.to_model()
+        else:
+            company = companies.get(self.company)
+            if company is None:
+                company = companies[self.company] = self.company.to_model()
+        # Field types are already right, so skip re-validation
+        return Lead.model_construct(
+            id=self.id,
+            name=self.name,
+            title=self.title,
+            company=company,
+            location_person=self.location_person,
+            email=self.email,
+            linkedin_url=self.linkedin_url,
+            phone=self.phone,
+            publications=list(self.publications),
+            score=self.score,
+            score_mask=self.score_mask,
+            score_keys=self.score_keys,
+            score_breakdown=list(self.score_breakdown),
+            rank_tier=self.rank_tier,
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Same shape as Lead.model_dump().
+        """
+        company = self.company
+        return {
+            "id": self.id,
+            "name": self.name,
+            "title": self.title,
+            "company": {
+                "name": company.name,
+                "industry": company.industry,
+                "location_hq": company.location_hq,
+                "funding_stage": company.funding_stage,
+                "uses_invitro_tech": company.uses_invitro_tech,
+                "open_to_nams": company.open_to_nams,
+            },
+            "location_person": self.location_person,
+            "email": self.email,
+            "linkedin_url": self.linkedin_url,
+            "phone": self.phone,
+            "publications": list(self.publications),
+            "score": self.score,
+            "score_mask": self.score_mask,
+            "score_keys": self.score_keys,
+            "score_breakdown": list(self.score_breakdown),
+            "rank_tier": self.rank_tier,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, companies: CompanyTable) -> "LeadRecord":
+        """
+        Inverse of to_dict (or of Lead.model_dump()), interning the company.
+        """
+        return cls(
+            id=data["id"],
+            name=data["name"],
+            title=data["title"],
+            company=companies.get(**data["company"]),
+            location_person=data["location_person"],
+            email=data["email"],
+            linkedin_url=data["linkedin_url"],
+            phone=data.get("phone"),
+            publications=tuple(data.get("publications", ())),
+            score=data.get("score", 0.0),
+            score_mask=data.get("score_mask", 0),
+            score_keys=data.get("score_keys", 0),
+            score_breakdown=tuple(data.get("score_breakdown", ())),
+            rank_tier=data.get("rank_tier", "Low"),
+        )
+
+
+# Anything ProbabilityEngine can score: both expose the same attributes
+LeadLike = Union[Lead, LeadRecord]
+
+
+def to_leads(records: Iterable[LeadRecord]) -> List[Lead]:
+    """
+    Converts records to Pydantic Leads for export, one Company per interned company.
+    """
+    companies: Dict[CompanyRecord, Company] = {}
+    return [record.to_model(companies) for record in records]
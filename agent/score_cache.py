@@ -0,0 +1,30 @@
+import hashlib
+import json
+
+from agent.batch import scoring_row
+from agent.json_cache import JsonLRUCache
+from agent.models import Lead
+
+
+class ScoreCache(JsonLRUCache):
+    """
+    Persistent LRU cache of (score, score_mask, score_keys, tier) keyed by a
+    hash of the fields scoring reads. The file records the engine's rules
+    version and is discarded when it no longer matches, so keyword or weight
+    changes never serve stale scores.
+    """
+
+    def __init__(self, path: str = "agent/.cache/score_cache.json", max_entries: int = 200_000):
+        super().__init__(path, max_entries)
+
+    def bind(self, rules_version: str):
+        """
+        Called by ProbabilityEngine with its rules version; loads the cache
+        file if it was written under the same rules.
+        """
+        self.load(rules_version)
+
+    @staticmethod
+    def key_for(lead: Lead) -> str:
+        payload = json.dumps(scoring_row(lead), ensure_ascii=False)
+        return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
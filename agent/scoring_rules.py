@@ -0,0 +1,381 @@
+import argparse
+import hashlib
+import json
+import os
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from agent.batch import BatchResult, LeadBatch, score_rules
+from agent.exporter import atomic_write
+from agent.matcher import KeywordMatcher
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), "scoring_rules.json")
+
+# Bump when the evaluator changes in a way the rule files don't capture
+EVALUATOR_VERSION = 2
+
+# Memoized breakdown renderings per ScoringRules
+RENDER_MEMO_SIZE = 100_000
+
+# Fields a rule may read: exactly the ones in batch.scoring_row, which also
+# keys the score cache, so a cached score can never depend on anything else
+SCALAR_FIELDS = {
+    "title", "company.name", "company.funding_stage", "company.uses_invitro_tech",
+    "company.open_to_nams", "location_person", "company.location_hq",
+}
+LIST_FIELDS = {"publications"}
+
+MATCH_TYPES = ("keywords", "one_of", "flag")
+
+
+def load_rules(path: str = DEFAULT_RULES_PATH) -> "ScoringRules":
+    """
+    Reads and compiles a rule file: JSON, or YAML when the name ends in
+    .yaml/.yml (needs PyYAML).
+    """
+    with open(path, "r") as f:
+        if path.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError as e:
+                raise ImportError("YAML rule files need PyYAML: pip install pyyaml") from e
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    return ScoringRules(spec)
+
+
+class Rule:
+    """
+    One compiled rule: its matcher (or value lookup), and `reasons[i]`, the
+    breakdown line for matched option i (keyword, value, or 0 for a flag),
+    rendered once at compile time. `key_width` is the number of bits the
+    option ID takes in a lead's packed `score_keys`.
+    """
+
+    __slots__ = ("name", "label", "weight", "match", "fields", "join", "options", "reasons", "matcher", "lookup", "condition_key", "key_width")
+
+    def __init__(self, spec: dict):
+        self.name = spec.get("name") or "rule"
+        self.label = spec.get("label", self.name)
+        self.match = spec.get("match")
+        self.fields = tuple(spec.get("fields", ()))
+        self.join = bool(spec.get("join", False))
+        if self.match not in MATCH_TYPES:
+            raise ValueError(f"Rule '{self.name}': unknown match '{self.match}'. Available: {', '.join(MATCH_TYPES)}")
+        if isinstance(spec.get("weight"), bool) or not isinstance(spec.get("weight"), (int, float)):
+            raise ValueError(f"Rule '{self.name}': 'weight' must be a number")
+        self.weight = spec["weight"]
+
+        unknown = [f for f in self.fields if f not in SCALAR_FIELDS | LIST_FIELDS]
+        if not self.fields or unknown:
+            raise ValueError(f"Rule '{self.name}': fields must be a non-empty subset of {sorted(SCALAR_FIELDS | LIST_FIELDS)}")
+        if any(f in LIST_FIELDS for f in self.fields) and (len(self.fields) > 1 or self.match != "keywords"):
+            raise ValueError(f"Rule '{self.name}': a list field must be the only field of a keywords rule")
+        if self.match != "keywords" and len(self.fields) > 1:
+            raise ValueError(f"Rule '{self.name}': '{self.match}' rules read exactly one field")
+
+        if self.match == "keywords":
+            keywords = spec.get("keywords", ())
+            if any(not isinstance(k, str) or not k.strip() for k in keywords):
+                raise ValueError(f"Rule '{self.name}': keywords must be non-empty strings")
+            self.options = tuple(k.lower() for k in keywords)
+        elif self.match == "one_of":
+            self.options = tuple(spec.get("values", ()))
+        else:
+            self.options = ("",)
+        template = f"{self.label} (+{self.weight}): {spec.get('reason', '{match}')}"
+        self.reasons = tuple(template.format(match=option) for option in self.options)
+        self.key_width = (len(self.options) - 1).bit_length() if self.options else 0
+
+        # Rules with the same condition (whatever their weight or wording)
+        # match the same leads, so A/B runs evaluate them only once
+        self.condition_key = json.dumps([self.match, self.fields, self.join, self.options])
+        self.matcher = KeywordMatcher(self.options) if self.match == "keywords" else None
+        self.lookup = {}
+        for i, value in enumerate(self.options):
+            self.lookup.setdefault(value, i)
+
+    def source(self, k: int) -> List[str]:
+        """
+        Statements that set `i` to the matched option index (or -1) for rule
+        number `k` of the generated evaluator.
+        """
+        # Field names come from the fixed SCALAR_FIELDS/LIST_FIELDS whitelist
+        values = [f"lead.{field}" for field in self.fields]
+        if self.match == "flag":
+            return [f"i = 0 if {values[0]} else -1"]
+        if self.match == "one_of":
+            return [f"i = lookup_{k}({values[0]}, -1)"]
+        if self.fields[0] in LIST_FIELDS:
+            # First item (e.g. publication) that matches anything decides
+            return [
+                "i = -1",
+                f"for item in {values[0]}:",
+                f"    i = match_{k}(item.lower())",
+                "    if i >= 0:",
+                "        break",
+            ]
+        if self.join:
+            # One text, e.g. title + company name
+            joined = ' + " " + '.join(values)
+            return [f"i = match_{k}(({joined}).lower())"]
+        # Earliest-listed keyword found in any of the fields
+        return [f"i = match_{k}({', '.join(v + '.lower()' for v in values)})"]
+
+
+class ScoringRules:
+    """
+    A rule file compiled once into a scoring function. Keyword lists become
+    KeywordMatchers and the flat rule table is turned into straight-line
+    Python (one block per rule, no per-rule dispatch) with tiers looked up
+    by score. `rules_hash` identifies the rule set for score-cache
+    invalidation.
+
+    Scoring records which rules matched as two integers instead of text:
+    `score_mask` has bit k set when rule k matched, and `score_keys` packs
+    the matched option IDs into fixed bit fields (rule k at `key_offsets[k]`).
+    The human-readable breakdown is rendered from them only on request
+    (render / explain).
+    """
+
+    def __init__(self, spec: dict):
+        self.spec = spec
+        self.rules: List[Rule] = [Rule(rule) for rule in spec.get("rules", [])]
+        names = [rule.name for rule in self.rules]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate rule names: {', '.join(duplicates)}")
+
+        self.max_score = spec.get("max_score", 100)
+        # (minimum score, tier), checked in order; anything below is default_tier
+        self.tier_cutoffs = [(t["min_score"], t["tier"]) for t in spec.get("tiers", [])]
+        self.default_tier = spec.get("default_tier", "Low")
+        self.tiers = [tier for _, tier in self.tier_cutoffs] + [self.default_tier]
+
+        if not isinstance(self.max_score, int) or self.max_score < 0:
+            raise ValueError("'max_score' must be a non-negative integer")
+        self._tier_table = [self._find_tier(score) for score in range(self.max_score + 1)]
+        self.key_offsets = []
+        offset = 0
+        for rule in self.rules:
+            self.key_offsets.append(offset)
+            offset += rule.key_width
+        self.key_bits = offset
+        self._render_memo: Dict[tuple, tuple] = {}
+        self.rules_hash = hashlib.sha256(
+            json.dumps({"evaluator": EVALUATOR_VERSION, "rules": spec}, sort_keys=True).encode()
+        ).hexdigest()[:16]
+        self.score = self._compile()
+
+    @classmethod
+    def coerce(cls, rules: Union[None, str, dict, "ScoringRules"]) -> "ScoringRules":
+        """
+        Accepts compiled rules, a spec dict, a rule file path, or None for
+        the default rules in agent/scoring_rules.json.
+        """
+        if isinstance(rules, ScoringRules):
+            return rules
+        if isinstance(rules, dict):
+            return cls(rules)
+        return load_rules(rules or DEFAULT_RULES_PATH)
+
+    def rule(self, name: str) -> Rule:
+        for rule in self.rules:
+            if rule.name == name:
+                return rule
+        raise KeyError(name)
+
+    def _find_tier(self, score) -> str:
+        for cutoff, tier in self.tier_cutoffs:
+            if score >= cutoff:
+                return tier
+        return self.default_tier
+
+    def tier_for(self, score) -> str:
+        if 0 <= score <= self.max_score and score == int(score):
+            return self._tier_table[int(score)]
+        return self._find_tier(score)
+
+    def _compile(self) -> Callable:
+        """
+        Builds score(lead), which sets score, score_mask, score_keys and
+        rank_tier on `lead` and returns the score. Only ints are built per lead.
+        """
+        namespace = {"tier_table": self._tier_table, "tier_for": self.tier_for}
+        lines = ["def score(lead):", "    score = 0", "    mask = 0", "    keys = 0"]
+        for k, rule in enumerate(self.rules):
+            if rule.matcher is not None:
+                namespace[f"match_{k}"] = rule.matcher.first_index
+            else:
+                namespace[f"lookup_{k}"] = rule.lookup.get
+            lines.append(f"    # {rule.name!r}")
+            lines.extend("    " + line for line in rule.source(k))
+            lines.append("    if i >= 0:")
+            lines.append(f"        score += {rule.weight!r}")
+            lines.append(f"        mask |= {1 << k}")
+            if rule.key_width:
+                lines.append(f"        keys |= i << {self.key_offsets[k]}" if self.key_offsets[k] else "        keys |= i")
+
+        # Non-negative integer weights keep the capped score inside the tier table
+        exact = all(isinstance(rule.weight, int) and rule.weight >= 0 for rule in self.rules)
+        lines += [
+            f"    if score > {self.max_score}:",
+            f"        score = {self.max_score}",
+            "    lead.score = score",
+            "    lead.score_mask = mask",
+            "    lead.score_keys = keys",
+            f"    lead.rank_tier = {'tier_table[score]' if exact else 'tier_for(score)'}",
+            "    return score",
+        ]
+        exec(compile("\n".join(lines), f"<scoring rules {self.rules_hash}>", "exec"), namespace)
+        return namespace["score"]
+
+    def render(self, mask: int, keys: int) -> Tuple[str, ...]:
+        """
+        The breakdown lines for a lead's (score_mask, score_keys), in rule order.
+        """
+        memo_key = (mask, keys)
+        lines = self._render_memo.get(memo_key)
+        if lines is None:
+            lines = tuple(
+                rule.reasons[(keys >> offset) & ((1 << rule.key_width) - 1)]
+                for k, (rule, offset) in enumerate(zip(self.rules, self.key_offsets))
+                if mask >> k & 1
+            )
+            if len(self._render_memo) >= RENDER_MEMO_SIZE:
+                self._render_memo.clear()
+            self._render_memo[memo_key] = lines
+        return lines
+
+    def explain(self, leads: Iterable) -> Iterable:
+        """
+        Fills score_breakdown on scored leads (Lead, LeadRecord) in place.
+        """
+        for lead in leads:
+            lead.score_breakdown = list(self.render(lead.score_mask, lead.score_keys))
+        return leads
+
+
+def rules_path_for(leads_path: str) -> str:
+    """
+    Where the rules an export was scored with are saved, next to the export:
+    dashboard/public/leads_data.json -> dashboard/public/leads_data.rules.json
+    """
+    return os.path.splitext(leads_path)[0] + ".rules.json"
+
+
+def write_export_rules(rules: "ScoringRules", leads_path: str) -> str:
+    """
+    Saves the rule spec next to an export, so its score_mask/score_keys can
+    be rendered later even if the default rule file has changed since.
+    """
+    path = rules_path_for(leads_path)
+    atomic_write(path, lambda f: json.dump(rules.spec, f, indent=2), mode="w")
+    return path
+
+
+def load_export_rules(leads_path: str) -> "ScoringRules":
+    """
+    The rules saved with an export, or the default rules when there are none.
+    """
+    path = rules_path_for(leads_path)
+    return load_rules(path if os.path.exists(path) else DEFAULT_RULES_PATH)
+
+
+@dataclass
+class RuleComparison:
+    """
+    Two rule sets scored over the same batch; rows align with the batch.
+    """
+    a: BatchResult
+    b: BatchResult
+    rules_a: ScoringRules
+    rules_b: ScoringRules
+
+    def summary(self, top_k: int = 100) -> dict:
+        k = min(top_k, len(self.a.score))
+        overlap = len(set(self.a.order[:k].tolist()) & set(self.b.order[:k].tolist()))
+        changed = self.a.rank_tier != self.b.rank_tier
+        return {
+            "leads": len(self.a.score),
+            "rules_hash": {"a": self.rules_a.rules_hash, "b": self.rules_b.rules_hash},
+            "mean_score": {
+                "a": float(self.a.score.mean()) if len(self.a.score) else 0.0,
+                "b": float(self.b.score.mean()) if len(self.b.score) else 0.0,
+            },
+            "tier_counts": {
+                "a": dict(Counter(self.a.rank_tier.tolist())),
+                "b": dict(Counter(self.b.rank_tier.tolist())),
+            },
+            "tier_changes": int(changed.sum()),
+            "transitions": {
+                f"{ta} -> {tb}": n
+                for (ta, tb), n in Counter(zip(self.a.rank_tier[changed].tolist(), self.b.rank_tier[changed].tolist())).most_common()
+            },
+            f"top_{top_k}_overlap": overlap / k if k else 1.0,
+        }
+
+
+def compare_rule_sets(leads, rules_a, rules_b) -> RuleComparison:
+    """
+    A/B two rule sets over the same leads (a LeadBatch or a list of leads)
+    in one pass over the batch columns: every distinct rule condition is
+    evaluated once and shared by both sets, so rules that only differ in
+    weight or wording cost nothing extra. Leads are not modified.
+    """
+    rules_a = ScoringRules.coerce(rules_a)
+    rules_b = ScoringRules.coerce(rules_b)
+    batch = leads if isinstance(leads, LeadBatch) else LeadBatch.from_leads(leads)
+    outcomes: Dict[str, np.ndarray] = {}
+    return RuleComparison(
+        a=score_rules(rules_a, batch, outcomes),
+        b=score_rules(rules_b, batch, outcomes),
+        rules_a=rules_a,
+        rules_b=rules_b,
+    )
+
+
+def _load_leads(path: Optional[str], count: int, seed: int) -> list:
+    if path:
+        from agent.records import CompanyTable, LeadRecord
+        with open(path, "r") as f:
+            companies = CompanyTable()
+            return [LeadRecord.from_dict(data, companies) for data in json.load(f)]
+
+    import random
+    from agent.generator import DataGenerator
+    random.seed(seed)
+    return DataGenerator().generate_sample_records(count=count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scoring rule tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    hash_cmd = commands.add_parser("hash", help="print the rules hash of a rule file")
+    hash_cmd.add_argument("path", nargs="?", default=DEFAULT_RULES_PATH)
+
+    compare_cmd = commands.add_parser("compare", help="A/B two rule files over the same leads")
+    compare_cmd.add_argument("candidate", help="rule file to evaluate (B)")
+    compare_cmd.add_argument("--baseline", default=DEFAULT_RULES_PATH, help="rule file to compare against (A)")
+    compare_cmd.add_argument("--leads", help="exported leads JSON (default: seeded synthetic leads)")
+    compare_cmd.add_argument("--count", type=int, default=100_000)
+    compare_cmd.add_argument("--seed", type=int, default=0)
+    compare_cmd.add_argument("--top-k", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.command == "hash":
+        print(load_rules(args.path).rules_hash)
+        return
+
+    leads = _load_leads(args.leads, args.count, args.seed)
+    comparison = compare_rule_sets(leads, load_rules(args.baseline), load_rules(args.candidate))
+    print(json.dumps(comparison.summary(top_k=args.top_k), indent=2))
+
+
+if __name__ == "__main__":
+    main()
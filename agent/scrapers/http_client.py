@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Status codes worth retrying: rate limited or transient server trouble
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket. `rate` tokens are added per second up to
+    `capacity`; each request takes one, blocking until a token is available.
+    The default capacity of 1 spaces requests evenly with no initial burst.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else 1.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def build_session(pool_size: int = 10) -> requests.Session:
+    """
+    Session with a keep-alive connection pool large enough for `pool_size`
+    concurrent requests to the same host.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def request_with_retry(
+    session: requests.Session,
+    method: str,
+    url: str,
+    rate_limiter: RateLimiter = None,
+    max_retries: int = 3,
+    backoff: float = 1.0,
+    **kwargs,
+) -> requests.Response:
+    """
+    Sends a request through the rate limiter, retrying connection errors,
+    timeouts, 429s and 5xx responses with exponential backoff plus jitter.
+    A Retry-After header from the server takes precedence over the backoff.
+    """
+    kwargs.setdefault("timeout", 30)
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        delay = backoff * (2 ** attempt) + random.uniform(0, backoff)
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == max_retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or attempt == max_retries:
+                if response.status_code >= 400:
+                    # Release the connection before raising; nobody reads this body
+                    response.close()
+                    response.raise_for_status()
+                return response
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = float(retry_after)
+            # Hand the connection back to the pool before waiting; with
+            # stream=True an unread response would hold it open
+            response.close()
+
+        time.sleep(delay)
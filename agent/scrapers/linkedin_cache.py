@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+
+class LinkedInCache:
+    """
+    SQLite-backed cache of LinkedIn lookups: lookup key -> URL, where a NULL
+    URL records that the search found nothing. Found URLs expire after `ttl`
+    seconds, negative results after the (shorter) `negative_ttl`, so people
+    who create a profile later are eventually picked up.
+    """
+
+    def __init__(
+        self,
+        path: str = "agent/.cache/linkedin.sqlite",
+        ttl: float = 30 * 24 * 3600,
+        negative_ttl: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS lookups (key TEXT PRIMARY KEY, url TEXT, fetched_at REAL NOT NULL)"
+            )
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Returns {key: url or None} for the keys with an unexpired entry;
+        None means a cached "not found".
+        """
+        keys = list(dict.fromkeys(keys))
+        now = time.time()
+        found = {}
+        with self.lock:
+            # SQLite caps bound parameters per statement, so look up in slices
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT key, url, fetched_at FROM lookups WHERE key IN ({placeholders})", chunk
+                )
+                for key, url, fetched_at in rows:
+                    if now - fetched_at <= (self.ttl if url is not None else self.negative_ttl):
+                        found[key] = url
+
+        self.hits += sum(1 for url in found.values() if url is not None)
+        self.negative_hits += sum(1 for url in found.values() if url is None)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, url: Optional[str]):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO lookups VALUES (?, ?, ?)", (key, url, time.time()))
+
+    def stats(self) -> str:
+        return f"{self.hits} hits / {self.negative_hits} cached misses / {self.misses} searched"
+
+    def close(self):
+        self.conn.close()
@@ -1,58 +1,152 @@
-from googlesearch import search
-import time
-import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from agent.company_resolver import company_key
+from agent.scrapers.http_client import RateLimiter
+from agent.scrapers.linkedin_cache import LinkedInCache
+
+# A search backend takes a query and returns result URLs, best first
+SearchBackend = Callable[[str], List[str]]
+
+# Fallback for leads without a known profile: a LinkedIn search for the name
+SEARCH_URL_PREFIX = "www.linkedin.com/search/results/all/?keywords="
+
+
+def linkedin_search_url(name: str) -> str:
+    return SEARCH_URL_PREFIX + name.replace(" ", "%20")
+
+
+def is_search_url(url: str) -> bool:
+    return url.startswith(SEARCH_URL_PREFIX)
+
+
+def google_search(query: str) -> List[str]:
+    """
+    Default backend: Google Search via the 'googlesearch-python' library.
+    """
+    from googlesearch import search
+
+    # num_results=1 is part of the generator config in newer versions, or we just take next()
+    results = search(query, num_results=1, advanced=True)
+    # result is usually an object with .url, .title, .description in googlesearch-python
+    # or just a string in the older googlesearch
+    return [result.url if hasattr(result, 'url') else result for result in results]
+
 
 class LinkedInDiscoverer:
     """
-    Uses Google Search to find LinkedIn profiles for names and companies.
-    Note: This depends on the 'googlesearch-python' library.
+    Finds LinkedIn profiles for names and companies through a pluggable
+    search backend (Google by default). Lookups share one rate limiter,
+    so batches run concurrently while staying polite, and results, including
+    "not found", go through a persistent TTL cache when one is given.
     """
-    
-    def find_profile(self, name: str, company: str = "", keywords: str = "") -> str:
+
+    def __init__(
+        self,
+        backend: SearchBackend = None,
+        rate: float = 0.3,
+        max_workers: int = 4,
+        cache: Optional[LinkedInCache] = None,
+    ):
+        self.backend = backend or google_search
+        # ~One search every 3.3s on average, like the old random 2-5s pause
+        self.rate_limiter = RateLimiter(rate)
+        self.max_workers = max_workers
+        self.cache = cache
+        self.searches = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _profile_key(name: str, company: str = "", keywords: str = "") -> str:
+        return f"in|{' '.join(name.lower().split())}|{company_key(company)}|{keywords.lower()}"
+
+    @staticmethod
+    def _company_key(company_name: str) -> str:
+        return f"company|{company_key(company_name)}"
+
+    def _search(self, query: str, marker: str) -> Tuple[Optional[str], bool]:
         """
-        Returns the best matching LinkedIn URL or None.
+        (first result URL containing `marker` or None, whether the search
+        completed). Failed searches are not cached.
         """
+        self.rate_limiter.acquire()
+        with self.lock:
+            self.searches += 1
+        try:
+            urls = self.backend(query)
+        except Exception as e:
+            print(f"   -> Search error: {e}")
+            return None, False
+        for url in urls:
+            if marker in url:
+                return url, True
+        return None, True
+
+    def _lookup_many(self, queries: Dict[str, Tuple[str, str]]) -> Dict[str, Optional[str]]:
+        """
+        Resolves {cache key: (query, marker)}: cached keys are answered from
+        the cache, the rest are searched concurrently behind the rate limiter.
+        """
+        results = self.cache.get_many(queries) if self.cache is not None else {}
+        pending = [key for key in queries if key not in results]
+        if not pending:
+            return results
+
+        def run(key):
+            url, completed = self._search(*queries[key])
+            if completed and self.cache is not None:
+                self.cache.put(key, url)
+            return key, url
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            for key, url in pool.map(run, pending):
+                results[key] = url
+        return results
+
+    def _profile_query(self, name: str, company: str = "", keywords: str = "") -> str:
         # Construct a targeted query
         query = f'site:linkedin.com/in "{name}"'
         if company:
             query += f' "{company}"'
         if keywords:
             query += f' "{keywords}"'
-            
+        return query
+
+    def find_profile(self, name: str, company: str = "", keywords: str = "") -> str:
+        """
+        Returns the best matching LinkedIn URL or None.
+        """
         print(f"🕵️ Searching for: {name} at {company}...")
-        
-        try:
-            # Pause to be polite and avoid rate limits
-            time.sleep(random.uniform(2.0, 5.0))
-            
-            # Search for top 1 result
-            # num_results=1 is part of the generator config in newer versions, or we just take next()
-            results = search(query, num_results=1, advanced=True)
-            
-            for result in results:
-                # result is usually an object with .url, .title, .description in googlesearch-python
-                # or just a string in the older googlesearch
-                url = result.url if hasattr(result, 'url') else result
-                
-                if "linkedin.com/in" in url:
-                    print(f"   -> Found: {url}")
-                    return url
-                    
-            print("   -> No LinkedIn profile found.")
-            return None
-            
-        except Exception as e:
-            print(f"   -> Search error: {e}")
-            return None
+        key = self._profile_key(name, company, keywords)
+        url = self._lookup_many({key: (self._profile_query(name, company, keywords), "linkedin.com/in")})[key]
+        print(f"   -> Found: {url}" if url else "   -> No LinkedIn profile found.")
+        return url
+
+    def find_profiles(self, people: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Batch form of find_profile for (name, company) pairs. Each distinct
+        person is looked up once; returns {(name, company): URL or None}.
+        """
+        people = list(dict.fromkeys(people))
+        keys = {person: self._profile_key(*person) for person in people}
+        results = self._lookup_many({
+            keys[person]: (self._profile_query(*person), "linkedin.com/in") for person in people
+        })
+        return {person: results[keys[person]] for person in people}
 
     def find_company_linkedin(self, company_name: str) -> str:
-        query = f'site:linkedin.com/company "{company_name}"'
-        try:
-            time.sleep(random.uniform(1.5, 3.0))
-            results = search(query, num_results=1)
-            for url in results:
-                if "linkedin.com/company" in url:
-                    return url
-            return None
-        except:
-            return None
+        return self.find_companies([company_name])[company_name]
+
+    def find_companies(self, company_names: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Company pages for many names. Spellings with the same normalized
+        company key ("Genentech Inc" / "Genentech, Inc.") share one lookup.
+        """
+        names = list(dict.fromkeys(company_names))
+        keys = {name: self._company_key(name) for name in names}
+        queries = {}
+        for name in names:
+            queries.setdefault(keys[name], (f'site:linkedin.com/company "{name}"', "linkedin.com/company"))
+        results = self._lookup_many(queries)
+        return {name: results[keys[name]] for name in names}
@@ -0,0 +1,85 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class PubMedCache:
+    """
+    SQLite-backed cache for PubMed responses.
+    - articles: PMID -> parsed article record (published metadata rarely changes)
+    - searches: query -> PMID list, expiring after `search_ttl` seconds
+    Hit/miss counters show how many network round trips were avoided.
+    """
+
+    def __init__(self, path: str = "agent/.cache/pubmed.sqlite", search_ttl: float = 24 * 3600):
+        self.path = path
+        self.search_ttl = search_ttl
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS articles (pmid TEXT PRIMARY KEY, record TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS searches (query TEXT PRIMARY KEY, ids TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+        self.article_hits = 0
+        self.article_misses = 0
+        self.search_hits = 0
+        self.search_misses = 0
+
+    def get_articles(self, pmids: List[str]) -> Dict[str, Dict]:
+        """
+        Returns the cached records for whichever of `pmids` are present.
+        """
+        found = {}
+        with self.lock:
+            # SQLite caps bound parameters per statement, so look up in slices
+            for i in range(0, len(pmids), 500):
+                chunk = pmids[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self.conn.execute(
+                    f"SELECT pmid, record FROM articles WHERE pmid IN ({placeholders})", chunk
+                )
+                for pmid, record in rows:
+                    found[pmid] = json.loads(record)
+
+        self.article_hits += len(found)
+        self.article_misses += len(set(pmids)) - len(found)
+        return found
+
+    def put_articles(self, articles: List[Dict]):
+        now = time.time()
+        rows = [(a["pmid"], json.dumps(a), now) for a in articles if a.get("pmid")]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?)", rows)
+
+    def get_search(self, query: str) -> Optional[List[str]]:
+        with self.lock:
+            row = self.conn.execute("SELECT ids, created_at FROM searches WHERE query = ?", (query,)).fetchone()
+        if row is None or time.time() - row[1] > self.search_ttl:
+            self.search_misses += 1
+            return None
+        self.search_hits += 1
+        return json.loads(row[0])
+
+    def put_search(self, query: str, ids: List[str]):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?)", (query, json.dumps(ids), time.time())
+            )
+
+    def stats(self) -> str:
+        return (
+            f"articles {self.article_hits} hits / {self.article_misses} misses, "
+            f"searches {self.search_hits} hits / {self.search_misses} misses"
+        )
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,104 @@
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, Optional
+
+
+# Regex for simple email extraction, compiled once
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+
+
+def parse_article(article: ET.Element) -> Optional[Dict]:
+    """
+    Extracts title, authors, affiliations and emails from one <PubmedArticle>
+    in a single walk over its elements. Each distinct affiliation is scanned
+    for emails once, and every author is mapped to the first email found in
+    their own affiliation (`author_emails`).
+    Returns None if the record is malformed.
+    """
+    try:
+        title = None
+        pmid = None
+        authors_list = []
+        # Affiliation -> emails found in it (dict keeps first-seen order)
+        affiliations = {}
+        author_emails = {}
+
+        for node in article.iter():
+            tag = node.tag
+            if tag == "ArticleTitle":
+                if title is None:
+                    title = node.text or "No Title"
+            elif tag == "PMID":
+                if pmid is None:
+                    pmid = node.text
+            elif tag == "Author":
+                last_name = node.find("LastName")
+                fore_name = node.find("ForeName")
+                if last_name is None or fore_name is None:
+                    continue
+
+                full_name = f"{fore_name.text} {last_name.text}"
+                authors_list.append(full_name)
+
+                # Get affiliation info to find Companies & Emails
+                aff_node = node.find(".//Affiliation")
+                if aff_node is not None:
+                    aff_text = aff_node.text
+                    emails = affiliations.get(aff_text)
+                    if emails is None:
+                        # Remove trailing dot if present (common in pubmed data like "email@domain.com.")
+                        emails = [e.rstrip('.') for e in EMAIL_RE.findall(aff_text)]
+                        affiliations[aff_text] = emails
+                    if emails and full_name not in author_emails:
+                        author_emails[full_name] = emails[0]
+
+        if pmid is None:
+            return None
+
+        all_emails = {e: None for emails in affiliations.values() for e in emails}
+
+        return {
+            "pmid": pmid,
+            "title": title or "No Title",
+            "authors": authors_list,
+            "affiliations": list(affiliations),
+            "emails": list(all_emails), # Return unique emails found
+            "author_emails": author_emails,
+            "source": "PubMed",
+            "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/"
+        }
+
+    except Exception:
+        return None
+
+
+def iter_articles(blocks: Iterable[bytes]) -> Iterator[Dict]:
+    """
+    Incrementally parses an efetch XML payload fed in as byte blocks (e.g.
+    response.iter_content()) and yields each article as soon as its
+    </PubmedArticle> closes. Finished records are cleared from the tree, so
+    memory stays flat however many articles the payload holds.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    root = None
+    depth = 0
+
+    for block in blocks:
+        parser.feed(block)
+        for event, elem in parser.read_events():
+            if event == "start":
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+
+            depth -= 1
+            if elem.tag == "PubmedArticle":
+                article = parse_article(elem)
+                if article is not None:
+                    yield article
+            # Drop each finished top-level record (articles, book articles, ...)
+            if depth == 1:
+                root.clear()
+
+    parser.close()
@@ -1,8 +1,12 @@
-import requests
-import re
-import xml.etree.ElementTree as ET
-from datetime import datetime
-from typing import List, Dict, Optional
+import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Optional
+
+from agent import instrumentation
+from agent.scrapers.http_client import RateLimiter, build_session, request_with_retry
+from agent.scrapers.pubmed_cache import PubMedCache
+from agent.scrapers.pubmed_parser import iter_articles
 
 class PubMedScraper:
     """
@@ -11,34 +15,89 @@ class PubMedScraper:
     """
     
     BASE_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils"
+    CHUNK_SIZE = 200
+    STREAM_BLOCK_SIZE = 64 * 1024
     
-    def __init__(self, email: str = "agent@leadlattice.ai"):
+    def __init__(
+        self,
+        email: str = "agent@leadlattice.ai",
+        api_key: Optional[str] = None,
+        max_workers: int = 3,
+        base_url: Optional[str] = None,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        chunk_size: Optional[int] = None,
+        cache: Optional[PubMedCache] = None,
+    ):
         # NCBI requires an email parameter for contact if we hit rate limits
         self.email = email
+        self.api_key = api_key
+        self.max_workers = max_workers
+        self.base_url = base_url or self.BASE_URL
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # Streaming parse keeps memory flat, so chunks larger than 200 IDs are fine
+        self.chunk_size = chunk_size or self.CHUNK_SIZE
+        # Optional on-disk cache of parsed articles and search results
+        self.cache = cache
+
+        # One pooled keep-alive session shared by all fetch threads.
+        # NCBI allows 3 requests/s, or 10/s with an API key.
+        self.session = build_session(pool_size=max_workers)
+        self.rate_limiter = RateLimiter(rate=10 if api_key else 3)
+
+    def _params(self, **params) -> dict:
+        params["email"] = self.email
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
+
+    def _request(self, method: str, endpoint: str, **kwargs):
+        return request_with_retry(
+            self.session,
+            method,
+            f"{self.base_url}/{endpoint}",
+            rate_limiter=self.rate_limiter,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            **kwargs,
+        )
+
+    def _build_term(self, keywords: List[str]) -> str:
+        # Construct query: (Keyword1 OR Keyword2) AND ("2024"[Date - Publication] : "3000"[Date - Publication])
+        # Using a simpler date filter for last 2 years approx
+        term = "(" + " OR ".join(keywords) + ")"
+        term += ' AND ("2023/01/01"[Date - Publication] : "3000"[Date - Publication])'
+        return term
 
     def search_articles(self, keywords: List[str], max_results: int = 20) -> List[str]:
         """
         Search for articles matching keywords and return list of PubMed IDs (PMIDs).
         Focuses on last 2 years.
         """
-        # Construct query: (Keyword1 OR Keyword2) AND ("2024"[Date - Publication] : "3000"[Date - Publication])
-        # Using a simpler date filter for last 2 years approx
-        term = "(" + " OR ".join(keywords) + ")"
-        term += ' AND ("2023/01/01"[Date - Publication] : "3000"[Date - Publication])'
+        term = self._build_term(keywords)
+        
+        cache_key = json.dumps({"term": term, "retmax": max_results}, sort_keys=True)
+        if self.cache is not None:
+            cached = self.cache.get_search(cache_key)
+            if cached is not None:
+                return cached
         
-        params = {
-            "db": "pubmed",
-            "term": term,
-            "retmode": "json",
-            "retmax": max_results,
-            "email": self.email
-        }
+        params = self._params(
+            db="pubmed",
+            term=term,
+            retmode="json",
+            retmax=max_results,
+        )
         
         try:
-            response = requests.get(f"{self.BASE_URL}/esearch.fcgi", params=params)
-            response.raise_for_status()
+            with instrumentation.current().stage("pubmed.esearch"):
+                response = self._request("GET", "esearch.fcgi", params=params)
             data = response.json()
-            return data.get("esearchresult", {}).get("idlist", [])
+            ids = data.get("esearchresult", {}).get("idlist", [])
+            if self.cache is not None:
+                self.cache.put_search(cache_key, ids)
+            return ids
         except Exception as e:
             print(f"Error searching PubMed: {e}")
             return []
@@ -47,92 +106,154 @@ class PubMedScraper:
         """
         Fetch detailed info for a list of PMIDs.
         Extracts: Title, Authors, Affiliation (Company/Uni).
+        Chunks are fetched concurrently (up to `max_workers` at once) behind
+        the shared rate limiter; results keep the input chunk order.
+        With a cache, only PMIDs not already cached are requested.
         """
         if not pmids:
             return []
             
-        all_articles = []
-        chunk_size = 200
+        if self.cache is None:
+            return self._fetch_uncached(pmids)
         
-        for i in range(0, len(pmids), chunk_size):
-            chunk = pmids[i:i + chunk_size]
-            
-            params = {
-                "db": "pubmed",
-                "id": ",".join(chunk),
-                "retmode": "xml",
-                "email": self.email
-            }
-            
-            try:
-                response = requests.post(f"{self.BASE_URL}/efetch.fcgi", data=params) # Use POST for large ID lists
-                response.raise_for_status()
-                
-                # Parse XML
-                root = ET.fromstring(response.content)
+        cached = self.cache.get_articles(pmids)
+        missing = [pmid for pmid in pmids if pmid not in cached]
+        fetched = self._fetch_uncached(missing) if missing else []
+        self.cache.put_articles(fetched)
+        
+        by_pmid = {**cached, **{a["pmid"]: a for a in fetched}}
+        return [by_pmid[pmid] for pmid in pmids if pmid in by_pmid]
+
+    def iter_details(self, pmids: List[str]) -> Iterator[Dict]:
+        """
+        Streaming counterpart of fetch_details: yields articles chunk by chunk,
+        in input chunk order, serving cached PMIDs without a request. Up to
+        `max_workers` chunk fetches are in flight at once behind the shared
+        rate limiter; the window only advances as the consumer reads, so a
+        slow consumer holds back fetching instead of buffering results.
+        """
+        window = deque()  # (cached articles, future or None) per chunk, oldest first
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            for i in range(0, len(pmids), self.chunk_size):
+                chunk = pmids[i:i + self.chunk_size]
+                cached, missing = [], chunk
+                if self.cache is not None:
+                    hits = self.cache.get_articles(chunk)
+                    cached = [hits[pmid] for pmid in chunk if pmid in hits]
+                    missing = [pmid for pmid in chunk if pmid not in hits]
                 
-                for article in root.findall(".//PubmedArticle"):
-                    try:
-                        title_node = article.find(".//ArticleTitle")
-                        title = title_node.text if (title_node is not None and title_node.text) else "No Title"
-                        
-                        authors_list = []
-                        affiliations = set()
-                        
-                        
-                        for author in article.findall(".//Author"):
-                            last_name = author.find("LastName")
-                            fore_name = author.find("ForeName")
-                            
-                            if last_name is not None and fore_name is not None:
-                                full_name = f"{fore_name.text} {last_name.text}"
-                                authors_list.append(full_name)
-                                
-                                # Get affiliation info to find Companies & Emails
-                                aff_node = author.find(".//Affiliation")
-                                if aff_node is not None:
-                                    aff_text = aff_node.text
-                                    affiliations.add(aff_text)
-                                    
-                                    # Try to find email in affiliation
-                                    # Regex for simple email extraction
-                                    emails = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', aff_text)
-                                    if emails:
-                                        found_email = emails[0]
-                                        # Map author to email (simple heuristic: associate with current author)
-                                        # In a strict sense we should store this better, but for now let's just 
-                                        # add it to a list or a map. Simpler: just return a list of emails found.
+                while missing and sum(1 for _, future in window if future is not None) >= self.max_workers:
+                    yield from self._drain(window)
+                window.append((cached, pool.submit(self._fetch_chunk, i, missing) if missing else None))
+                # Fully cached chunks at the head need no waiting
+                while window and window[0][1] is None:
+                    yield from window.popleft()[0]
+            while window:
+                yield from self._drain(window)
+        finally:
+            # Closed early: drop queued chunks, let in-flight requests finish
+            pool.shutdown(wait=True, cancel_futures=True)
 
-                        # Extract emails from all affiliations collected
-                        all_emails = []
-                        for aff in affiliations:
-                             found = re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', aff)
-                             all_emails.extend(found)
-                        
-                        # Remove trailing dot if present (common in pubmed data like "email@domain.com.")
-                        all_emails = [e.rstrip('.') for e in all_emails]
-    
-                        all_articles.append({
-                            "title": title,
-                            "authors": authors_list,
-                            "affiliations": list(affiliations),
-                            "emails": list(set(all_emails)), # Return unique emails found
-                            "source": "PubMed",
-                            "url": f"https://pubmed.ncbi.nlm.nih.gov/{article.find('.//PMID').text}/"
-                        })
-                        
-                    except Exception as parse_e:
-                        continue
-                        
+    def _drain(self, window: deque) -> Iterator[Dict]:
+        # Yields the oldest chunk in the window (cache writes stay on this thread)
+        cached, future = window.popleft()
+        yield from cached
+        if future is not None:
+            fetched = future.result()
+            if self.cache is not None:
+                self.cache.put_articles(fetched)
+            yield from fetched
+
+    def _fetch_uncached(self, pmids: List[str]) -> List[Dict]:
+        chunks = [(i, pmids[i:i + self.chunk_size]) for i in range(0, len(pmids), self.chunk_size)]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = pool.map(lambda args: self._fetch_chunk(*args), chunks)
+            return [article for chunk_articles in results for article in chunk_articles]
+
+    def _fetch_chunk(self, i: int, chunk: List[str]) -> List[Dict]:
+        params = self._params(
+            db="pubmed",
+            id=",".join(chunk),
+            retmode="xml",
+        )
+        
+        instruments = instrumentation.current()
+        try:
+            # Use POST for large ID lists; stream so parsing starts while the body is still arriving
+            # (pubmed.efetch covers rate-limit waits, retries and time to first byte)
+            with instruments.stage("pubmed.efetch"):
+                response = self._request("POST", "efetch.fcgi", data=params, stream=True)
+            with response, instruments.stage("pubmed.parse"):
+                # Body reads are timed as pubmed.download, so parse self time is pure XML work
+                body = instruments.metered(response.iter_content(chunk_size=self.STREAM_BLOCK_SIZE), "pubmed.download")
+                articles = list(iter_articles(body))
+            instruments.count("pubmed.articles", len(articles))
+            return articles
+        except Exception as e:
+            print(f"Error fetching details for chunk {i}: {e}")
+            return []
+
+    def iter_search_articles(self, keywords: List[str], limit: int = 10_000, page_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Paged search via the NCBI history server: one esearch with usehistory=y
+        stores the result set server-side, then efetch pages through it by
+        retstart/retmax using the returned WebEnv/query_key. Articles are
+        yielded as each page streams in, so no ID list is ever held or sent.
+        """
+        page_size = page_size or self.chunk_size
+        params = self._params(
+            db="pubmed",
+            term=self._build_term(keywords),
+            retmode="json",
+            retmax=0,
+            usehistory="y",
+        )
+        
+        instruments = instrumentation.current()
+        try:
+            with instruments.stage("pubmed.esearch"):
+                response = self._request("GET", "esearch.fcgi", params=params)
+            result = response.json().get("esearchresult", {})
+            webenv = result["webenv"]
+            query_key = result["querykey"]
+            total = min(int(result.get("count", 0)), limit)
+        except Exception as e:
+            print(f"Error searching PubMed: {e}")
+            return
+        
+        print(f"Found {total} articles on the history server. Streaming details...")
+        for retstart in range(0, total, page_size):
+            page_params = self._params(
+                db="pubmed",
+                WebEnv=webenv,
+                query_key=query_key,
+                retstart=retstart,
+                retmax=min(page_size, total - retstart),
+                retmode="xml",
+            )
+            page = []
+            try:
+                with instruments.stage("pubmed.efetch"):
+                    response = self._request("POST", "efetch.fcgi", data=page_params, stream=True)
+                with response:
+                    body = instruments.metered(response.iter_content(chunk_size=self.STREAM_BLOCK_SIZE), "pubmed.download")
+                    for article in iter_articles(body):
+                        page.append(article)
+                        yield article
             except Exception as e:
-                print(f"Error fetching details for chunk {i}: {e}")
-                continue
-                
-        return all_articles
+                print(f"Error fetching page at {retstart}: {e}")
+            
+            instruments.count("pubmed.articles", len(page))
+            if self.cache is not None:
+                self.cache.put_articles(page)
 
     def get_leads_from_papers(self, keywords: List[str], limit: int = 10):
         print(f"Searching PubMed for: {keywords}...")
         pmids = self.search_articles(keywords, max_results=limit)
         print(f"Found {len(pmids)} articles. Fetching details...")
         details = self.fetch_details(pmids)
+        if self.cache is not None:
+            print(f"PubMed cache: {self.cache.stats()}")
         return details
@@ -0,0 +1,242 @@
+import bisect
+import hashlib
+import json
+import os
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agent.exporter import atomic_write
+
+INDEX_VERSION = 1
+TOKEN_RE = re.compile(r"\w+")
+
+# Indexed fields, in bit order. A posting's mask records which fields of the
+# lead contain the token; query relevance is the summed weight of those fields.
+FIELDS = ["name", "title", "company", "location_hq", "publications"]
+FIELD_WEIGHTS = {
+    "name": 8,
+    "title": 4,
+    "company": 4,
+    "location_hq": 2,
+    "publications": 1,
+}
+# mask -> summed field weight, for every possible mask
+_MASK_WEIGHT = np.array(
+    [sum(FIELD_WEIGHTS[f] for bit, f in enumerate(FIELDS) if mask & (1 << bit)) for mask in range(1 << len(FIELDS))],
+    dtype=np.int32,
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def index_path_for(leads_path: str) -> str:
+    """
+    Where the search index of an exported leads file lives: next to it,
+    shared by every format of the same export (leads_data.json/.arrow).
+    """
+    return os.path.splitext(leads_path)[0] + ".index.npz"
+
+
+def fingerprint(ids: Iterable[str]) -> str:
+    """
+    Identity of an export: its lead IDs in file order. Independent of the
+    file format, so a JSON and an Arrow export of the same leads share it.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for lead_id in ids:
+        h.update(lead_id.encode())
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def _lead_fields(lead) -> Tuple[str, ...]:
+    # Accepts Lead models (export time) as well as exported dicts (serving time)
+    if isinstance(lead, dict):
+        company = lead.get("company") or {}
+        return (
+            lead.get("name") or "",
+            lead.get("title") or "",
+            company.get("name") or "",
+            company.get("location_hq") or "",
+            " ".join(lead.get("publications") or ()),
+        )
+    return (
+        lead.name,
+        lead.title,
+        lead.company.name,
+        lead.company.location_hq,
+        " ".join(lead.publications),
+    )
+
+
+def _lead_id(lead) -> str:
+    return lead["id"] if isinstance(lead, dict) else lead.id
+
+
+class SearchIndex:
+    """
+    Inverted token index over a list of leads. Documents are lead positions
+    in the exported file. Tokens are kept sorted, and their posting lists are
+    stored back to back in one array, so:
+    - an exact token is one slice of `postings`
+    - a prefix is a contiguous token range, hence also one slice
+    Postings within a token are ascending document IDs, each with a bitmask
+    of the fields the token occurs in.
+    """
+
+    def __init__(self, tokens: List[str], offsets: np.ndarray, postings: np.ndarray, masks: np.ndarray, n_docs: int, fingerprint: str):
+        self.tokens = tokens
+        self.offsets = offsets
+        self.postings = postings
+        self.masks = masks
+        self.n_docs = n_docs
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(cls, leads: Sequence) -> "SearchIndex":
+        inverted = {}
+        for doc, lead in enumerate(leads):
+            doc_masks = {}
+            for bit, text in enumerate(_lead_fields(lead)):
+                for token in tokenize(text):
+                    doc_masks[token] = doc_masks.get(token, 0) | (1 << bit)
+            for token, mask in doc_masks.items():
+                entry = inverted.get(token)
+                if entry is None:
+                    inverted[token] = entry = ([], [])
+                entry[0].append(doc)
+                entry[1].append(mask)
+
+        tokens = sorted(inverted)
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        for i, token in enumerate(tokens):
+            offsets[i + 1] = offsets[i] + len(inverted[token][0])
+        postings = np.fromiter((d for t in tokens for d in inverted[t][0]), dtype=np.int32, count=int(offsets[-1]))
+        masks = np.fromiter((m for t in tokens for m in inverted[t][1]), dtype=np.uint8, count=int(offsets[-1]))
+        return cls(tokens, offsets, postings, masks, len(leads), fingerprint(_lead_id(l) for l in leads))
+
+    # --- Persistence ---
+
+    def save(self, path: str):
+        """
+        Writes the index as an uncompressed .npz (temp file + rename). Tokens
+        are stored as one newline-joined UTF-8 blob; `\\w+` tokens never
+        contain a newline.
+        """
+        meta = {"version": INDEX_VERSION, "n_docs": self.n_docs, "fingerprint": self.fingerprint, "fields": FIELDS}
+        atomic_write(path, lambda f: np.savez(
+            f,
+            meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+            tokens=np.frombuffer("\n".join(self.tokens).encode(), dtype=np.uint8),
+            offsets=self.offsets,
+            postings=self.postings,
+            masks=self.masks,
+        ))
+
+    @classmethod
+    def load(cls, path: str, expected_fingerprint: Optional[str] = None) -> Optional["SearchIndex"]:
+        """
+        Loads a saved index, or returns None if it is missing, from another
+        index version, or (given `expected_fingerprint`) built for other leads.
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data["meta"].tobytes())
+                if meta.get("version") != INDEX_VERSION or meta.get("fields") != FIELDS:
+                    return None
+                if expected_fingerprint is not None and meta.get("fingerprint") != expected_fingerprint:
+                    return None
+                blob = data["tokens"].tobytes().decode()
+                return cls(
+                    blob.split("\n") if blob else [],
+                    data["offsets"],
+                    data["postings"],
+                    data["masks"],
+                    meta["n_docs"],
+                    meta["fingerprint"],
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    @classmethod
+    def load_or_build(cls, path: str, leads: Sequence) -> "SearchIndex":
+        index = cls.load(path, fingerprint(_lead_id(l) for l in leads))
+        return index if index is not None else cls.build(leads)
+
+    # --- Queries ---
+
+    def _segment(self, token: str, prefix: bool) -> Tuple[np.ndarray, np.ndarray, bool]:
+        """
+        (doc IDs, field masks, unique) of the postings slice for one token.
+        A prefix spanning several tokens may list a doc more than once.
+        """
+        lo = bisect.bisect_left(self.tokens, token)
+        if prefix:
+            # Tokens starting with `token` sort before token + U+10FFFF
+            hi = bisect.bisect_left(self.tokens, token + "\U0010ffff", lo)
+        else:
+            hi = lo + 1 if lo < len(self.tokens) and self.tokens[lo] == token else lo
+        start, end = self.offsets[lo], self.offsets[hi]
+        return self.postings[start:end], self.masks[start:end], hi - lo <= 1
+
+    def search(self, q: str, prefix_last: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Documents containing every query token, ranked by summed field
+        relevance (ties by document order). The last token is matched as a
+        prefix so results update while typing. Returns (doc IDs, relevance);
+        an empty query matches nothing.
+        """
+        tokens = tokenize(q)
+        if not tokens:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+
+        segments = [self._segment(t, prefix=prefix_last and i == len(tokens) - 1) for i, t in enumerate(tokens)]
+        # Exact tokens first, smallest first, so every step intersects with
+        # the shortest candidate list; a (possibly huge) prefix range goes last
+        segments.sort(key=lambda seg: (not seg[2], len(seg[0])))
+
+        docs = relevance = None
+        for seg_docs, seg_masks, unique in segments:
+            if docs is not None:
+                if len(docs) == 0:
+                    break
+                if not unique:
+                    # Drop postings of non-candidates before merging the range
+                    member = np.zeros(self.n_docs, dtype=bool)
+                    member[docs] = True
+                    keep = member[seg_docs]
+                    seg_docs, seg_masks = seg_docs[keep], seg_masks[keep]
+            if not unique:
+                # A doc matching several tokens of the range: union of their fields
+                merged = np.zeros(self.n_docs, dtype=np.uint8)
+                np.bitwise_or.at(merged, seg_docs, seg_masks)
+                seg_docs = np.flatnonzero(merged).astype(np.int32)
+                seg_masks = merged[seg_docs]
+            seg_relevance = _MASK_WEIGHT[seg_masks]
+
+            if docs is None:
+                docs, relevance = seg_docs, seg_relevance
+            else:
+                docs, i, j = np.intersect1d(docs, seg_docs, assume_unique=True, return_indices=True)
+                relevance = relevance[i] + seg_relevance[j]
+
+        order = np.lexsort((docs, -relevance))
+        return docs[order], relevance[order]
+
+    def stats(self) -> dict:
+        return {"docs": self.n_docs, "tokens": len(self.tokens), "postings": int(len(self.postings))}
+
+
+def write_search_index(leads: Sequence, leads_path: str) -> str:
+    """
+    Builds the search index of an export and saves it next to `leads_path`.
+    """
+    path = index_path_for(leads_path)
+    SearchIndex.build(leads).save(path)
+    return path
@@ -0,0 +1,33 @@
+"""
+Per-lead rank_leads vs. columnar rank_batch on the same leads.
+
+Usage: python -m benchmarks.bench_batch [num_leads]
+"""
+import sys
+import time
+
+from agent.batch import LeadBatch
+from agent.generator import DataGenerator
+from agent.ranker import ProbabilityEngine
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} leads...")
+    leads = DataGenerator().generate_sample_leads(count=count)
+    batch = LeadBatch.from_leads(leads)
+
+    start = time.perf_counter()
+    ProbabilityEngine().rank_leads(leads)
+    per_lead = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ProbabilityEngine().rank_batch(batch)
+    batched = time.perf_counter() - start
+
+    print(f"  rank_leads: {per_lead:7.2f}s ({per_lead / count * 1e6:6.2f} us/lead)")
+    print(f"  rank_batch: {batched:7.2f}s ({batched / count * 1e6:6.2f} us/lead)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Scoring with breakdown text built for every lead vs. the compact matched-rule
+mask with text rendered on demand, then the JSON export with and without the
+breakdown: bytes written, time to write, and time to parse it back.
+
+Usage: python -m benchmarks.bench_breakdown [num_leads]
+"""
+import io
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from agent.exporter import EXPORTERS, LAZY_FIELDS
+from agent.generator import DataGenerator
+from agent.ranker import ProbabilityEngine
+from agent.records import to_leads
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def score_peak(fn) -> float:
+    # Peak MB allocated while scoring, separately: tracemalloc slows allocation down
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 2**20
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    random.seed(0)
+    print(f"Generating {count:,} leads...")
+    records = DataGenerator().generate_sample_records(count=count)
+    engine = ProbabilityEngine()
+
+    def score_lazy():
+        return engine.rank_leads(records)
+
+    def score_eager():
+        return engine.explain(engine.rank_leads(records))
+
+    lazy, _ = timed(score_lazy)
+    eager, _ = timed(score_eager)
+    print(f"  score, mask only:      {lazy:6.2f}s ({lazy / count * 1e6:5.2f} us/lead)  peak {score_peak(score_lazy):7.1f} MB")
+    print(f"  score + breakdown:     {eager:6.2f}s ({eager / count * 1e6:5.2f} us/lead)  peak {score_peak(score_eager):7.1f} MB")
+
+    # Breakdowns are rendered above, so both exports serialize the same leads
+    leads = to_leads(records)
+    for label, exclude in (("export without text", LAZY_FIELDS), ("export with text", None)):
+        out = io.BytesIO()
+        write_s, _ = timed(lambda: EXPORTERS["json"](leads, out, exclude))
+        payload = out.getvalue()
+        parse_s, _ = timed(lambda: json.loads(payload))
+        print(f"  {label + ':':<22} {len(payload) / 2**20:6.1f} MB  write {write_s:5.2f}s  parse {parse_s:5.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+LinkedIn discovery against a fake search backend with fixed latency:
+one-at-a-time lookups vs. the concurrent rate-limited batch, then a second
+batch served from the persistent cache. No network access is needed.
+
+Usage: python -m benchmarks.bench_linkedin [num_people]
+"""
+import random
+import sys
+import time
+
+from agent.scrapers.linkedin_cache import LinkedInCache
+from agent.scrapers.linkedin_discoverer import LinkedInDiscoverer
+
+LATENCY = 0.2  # seconds per fake search round trip
+RATE = 20.0    # searches per second allowed by the limiter
+
+
+def fake_backend(query):
+    time.sleep(LATENCY)
+    # Roughly half the people have a profile
+    if hash(query) % 2:
+        return ["https://www.linkedin.com/in/" + str(abs(hash(query)))]
+    return []
+
+
+def run(label, discoverer, people):
+    start = time.perf_counter()
+    profiles = discoverer.find_profiles(people)
+    elapsed = time.perf_counter() - start
+    found = sum(1 for url in profiles.values() if url)
+    print(f"  {label:<24} {elapsed:6.2f}s  {discoverer.searches:4d} searches  {found:4d} found")
+    return profiles
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    random.seed(0)
+    # ~20% of the batch repeats a person seen earlier (same author on several papers)
+    people = [(f"Author {i}", f"Company {i % 7}") for i in range(count)]
+    people += random.sample(people, count // 5)
+    print(f"Looking up {len(people)} people ({count} distinct), {LATENCY * 1000:.0f}ms per search, {RATE:.0f}/s limit")
+
+    run("sequential (1 worker)", LinkedInDiscoverer(backend=fake_backend, rate=RATE, max_workers=1), people)
+    cache = LinkedInCache(path=":memory:")
+    run("batch (8 workers)", LinkedInDiscoverer(backend=fake_backend, rate=RATE, max_workers=8, cache=cache), people)
+    run("batch, warm cache", LinkedInDiscoverer(backend=fake_backend, rate=RATE, max_workers=8, cache=cache), people)
+    print(f"  cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
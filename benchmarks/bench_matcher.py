@@ -0,0 +1,87 @@
+"""
+Per-lead scoring cost: inline keyword scans vs. the compiled KeywordMatcher.
+
+Usage: python -m benchmarks.bench_matcher [num_leads]
+"""
+import sys
+import time
+
+from agent.generator import DataGenerator
+from agent.ranker import ProbabilityEngine
+
+
+class InlineScanEngine(ProbabilityEngine):
+    """
+    The pre-matcher scoring path: keyword lists rebuilt per lead, any() then next().
+    """
+    def __init__(self):
+        super().__init__()
+        self.ROLE_KEYWORDS = self.rules.rule("role").options
+        self.HUBS = self.rules.rule("location").options
+        self.SCIENTIFIC_KEYWORDS = self.rules.rule("scientific").options
+
+    def _calculate_score(self, lead):
+        score = 0
+        breakdown = []
+        role_keywords = list(self.ROLE_KEYWORDS)
+        text_to_check = (lead.title + " " + lead.company.name).lower()
+        if any(k in text_to_check for k in role_keywords):
+            score += 30
+            match = next(k for k in role_keywords if k in text_to_check)
+            breakdown.append(f"Role Fit (+30): Found '{match}'")
+        if lead.company.funding_stage in ["Series A", "Series B"]:
+            score += 20
+            breakdown.append(f"Company Intent (+20): Funding match '{lead.company.funding_stage}'")
+        if lead.company.uses_invitro_tech:
+            score += 15
+            breakdown.append("Technographic (+15): Uses in-vitro tech")
+        if lead.company.open_to_nams:
+            score += 10
+            breakdown.append("Technographic (+10): Open to NAMs")
+        hubs = list(self.HUBS)
+        person_loc = lead.location_person.lower()
+        hq_loc = lead.company.location_hq.lower()
+        if any(h in person_loc for h in hubs) or any(h in hq_loc for h in hubs):
+            score += 10
+            match = next((h for h in hubs if h in person_loc or h in hq_loc), "Hub")
+            breakdown.append(f"Location (+10): In Hub '{match}'")
+        scientific_keywords = list(self.SCIENTIFIC_KEYWORDS)
+        for paper in lead.publications:
+            paper_lower = paper.lower()
+            if any(k in paper_lower for k in scientific_keywords):
+                match = next(k for k in scientific_keywords if k in paper_lower)
+                breakdown.append(f"Scientific Intent (+40): Published on '{match}'")
+                score += 40
+                break
+        lead.score = min(score, 100)
+        lead.score_breakdown = breakdown
+        if lead.score >= 80:
+            lead.rank_tier = "Highest"
+        elif lead.score >= 60:
+            lead.rank_tier = "High"
+        elif lead.score >= 40:
+            lead.rank_tier = "Medium"
+        else:
+            lead.rank_tier = "Low"
+        return lead.score
+
+
+def time_scoring(engine, leads) -> float:
+    start = time.perf_counter()
+    for lead in leads:
+        engine._calculate_score(lead)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"Generating {count:,} leads...")
+    leads = DataGenerator().generate_sample_leads(count=count)
+
+    for label, engine in [("inline scans", InlineScanEngine()), ("KeywordMatcher", ProbabilityEngine())]:
+        elapsed = time_scoring(engine, leads)
+        print(f"{label:>16}: {elapsed:7.2f}s total, {elapsed / count * 1e6:6.2f} us/lead")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Serial rank_leads vs. rank_leads_parallel across input sizes, to locate the
+crossover point where the process pool starts paying for itself.
+
+Usage: python -m benchmarks.bench_parallel [workers]
+"""
+import os
+import sys
+import time
+
+from agent.generator import DataGenerator
+from agent.ranker import ProbabilityEngine
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    print(f"Workers: {workers}")
+    print(f"{'leads':>10} {'serial':>10} {'parallel':>10} {'speedup':>8}")
+
+    crossover = None
+    for count in SIZES:
+        leads = DataGenerator().generate_sample_leads(count=count)
+
+        start = time.perf_counter()
+        ProbabilityEngine().rank_leads(leads)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ProbabilityEngine().rank_leads_parallel(leads, workers=workers)
+        parallel = time.perf_counter() - start
+
+        speedup = serial / parallel
+        if crossover is None and speedup > 1:
+            crossover = count
+        print(f"{count:>10,} {serial:>9.2f}s {parallel:>9.2f}s {speedup:>7.2f}x")
+
+    if crossover:
+        print(f"\nParallel path wins from ~{crossover:,} leads.")
+    else:
+        print("\nParallel path never beat the serial path at these sizes.")
+
+
+if __name__ == "__main__":
+    main()
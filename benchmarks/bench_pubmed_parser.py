@@ -0,0 +1,77 @@
+"""
+Per-article extraction cost on the efetch fixture: the legacy two-pass
+extraction (descendant searches, email regex run twice) vs. parse_article.
+
+Usage: python -m benchmarks.bench_pubmed_parser [repeats]
+"""
+import os
+import re
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+from agent.scrapers.pubmed_parser import iter_articles, parse_article
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "efetch_sample.xml")
+
+
+def legacy_parse_article(article):
+    title_node = article.find(".//ArticleTitle")
+    title = title_node.text if (title_node is not None and title_node.text) else "No Title"
+    authors_list = []
+    affiliations = set()
+    for author in article.findall(".//Author"):
+        last_name = author.find("LastName")
+        fore_name = author.find("ForeName")
+        if last_name is not None and fore_name is not None:
+            full_name = f"{fore_name.text} {last_name.text}"
+            authors_list.append(full_name)
+            aff_node = author.find(".//Affiliation")
+            if aff_node is not None:
+                aff_text = aff_node.text
+                affiliations.add(aff_text)
+                re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', aff_text)
+    all_emails = []
+    for aff in affiliations:
+        all_emails.extend(re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', aff))
+    all_emails = [e.rstrip('.') for e in all_emails]
+    return {
+        "title": title,
+        "authors": authors_list,
+        "affiliations": list(affiliations),
+        "emails": list(set(all_emails)),
+        "source": "PubMed",
+        "url": f"https://pubmed.ncbi.nlm.nih.gov/{article.find('.//PMID').text}/",
+    }
+
+
+def time_extraction(fn, articles, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for article in articles:
+            fn(article)
+    return time.perf_counter() - start
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with open(FIXTURE, "rb") as f:
+        payload = f.read()
+    articles = ET.fromstring(payload).findall(".//PubmedArticle")
+    total = len(articles) * repeats
+    print(f"Fixture: {len(articles)} articles, {len(payload) / 1024:.0f} KB; {repeats} repeats")
+
+    for label, fn in [("legacy extraction", legacy_parse_article), ("parse_article", parse_article)]:
+        elapsed = time_extraction(fn, articles, repeats)
+        print(f"{label:>20}: {elapsed / total * 1e6:7.1f} us/article")
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for _article in iter_articles([payload[i:i + 65536] for i in range(0, len(payload), 65536)]):
+            pass
+    elapsed = time.perf_counter() - start
+    print(f"{'stream parse+extract':>20}: {elapsed / total * 1e6:7.1f} us/article")
+
+
+if __name__ == "__main__":
+    main()
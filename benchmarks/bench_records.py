@@ -0,0 +1,98 @@
+"""
+Memory and construction cost of Pydantic Lead vs. slotted LeadRecord
+(interned companies), plus the one-off LeadRecord -> Lead export conversion.
+
+Usage: python -m benchmarks.bench_records [num_leads]
+"""
+import random
+import sys
+import time
+import tracemalloc
+
+from agent.generator import DataGenerator
+from agent.models import Company, Lead
+from agent.records import CompanyTable, LeadRecord, to_leads
+
+
+def build_leads(rows):
+    return [
+        Lead(
+            id=lead_id,
+            name=name,
+            title=title,
+            company=Company(**company),
+            location_person=location,
+            email=email,
+            linkedin_url=linkedin,
+            publications=list(publications),
+        )
+        for lead_id, name, title, company, location, email, linkedin, publications in rows
+    ]
+
+
+def build_records(rows):
+    companies = CompanyTable()
+    return [
+        LeadRecord(
+            id=lead_id,
+            name=name,
+            title=title,
+            company=companies.get(**company),
+            location_person=location,
+            email=email,
+            linkedin_url=linkedin,
+            publications=publications,
+        )
+        for lead_id, name, title, company, location, email, linkedin, publications in rows
+    ]
+
+
+def measure(label, build, rows):
+    # Time and memory in separate runs: tracemalloc slows allocation down
+    start = time.perf_counter()
+    result = build(rows)
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = len(rows)
+    print(f"  {label:<22} {size / count:8.0f} bytes/lead  {count / elapsed:12,.0f} leads/s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    print(f"Generating {count:,} leads...")
+    random.seed(0)
+    # Source fields as plain values, so both builders start from the same input
+    rows = [
+        (
+            r.id, r.name, r.title,
+            {
+                "name": r.company.name,
+                "industry": r.company.industry,
+                "location_hq": r.company.location_hq,
+                "funding_stage": r.company.funding_stage,
+                "uses_invitro_tech": r.company.uses_invitro_tech,
+                "open_to_nams": r.company.open_to_nams,
+            },
+            r.location_person, r.email, r.linkedin_url, r.publications,
+        )
+        for r in DataGenerator().generate_sample_records(count=count)
+    ]
+
+    measure("Lead (pydantic)", build_leads, rows)
+    records = measure("LeadRecord (slots)", build_records, rows)
+
+    start = time.perf_counter()
+    to_leads(records)
+    elapsed = time.perf_counter() - start
+    print(f"  {'to_leads (export)':<22} {'':>8}             {count / elapsed:12,.0f} leads/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Writes efetch_sample.xml: a deterministic PubmedArticleSet payload laid out
+like a real efetch (retmode=xml) response, used by the parser benchmarks so
+they run without network access.
+
+Usage: python -m benchmarks.fixtures.make_efetch_fixture [num_articles]
+"""
+import os
+import random
+import sys
+from xml.sax.saxutils import escape
+
+FIRST_NAMES = ["Sarah", "John", "Wei", "Yuki", "Anna", "Lukas", "Maria", "Rahul", "Elena", "Kenji", "Olivia", "Mehmet"]
+LAST_NAMES = ["Smith", "Chen", "Tanaka", "Müller", "Garcia", "Patel", "Rossi", "Kim", "Novak", "Okafor", "Silva", "Dubois"]
+AFFILIATIONS = [
+    "Genentech Inc, South San Francisco, CA 94080, USA.",
+    "Department of Pharmacology, University of Basel, Basel, Switzerland.",
+    "Emulate Inc., Boston, MA, USA. {email}.",
+    "Novartis Institutes for BioMedical Research, Cambridge, MA, USA.",
+    "InSphero AG, Schlieren, Switzerland. Electronic address: {email}.",
+    "Drug Safety Research and Development, Pfizer Inc, Groton, CT, USA.",
+    "School of Pharmacy, University of Nottingham, Nottingham, UK.",
+    "CN Bio Innovations Ltd, Cambridge, UK.",
+    "Division of Toxicology, Leiden Academic Centre for Drug Research, Leiden University, Leiden, The Netherlands.",
+    "Takeda Pharmaceutical Company Limited, Fujisawa, Kanagawa, Japan.",
+]
+TITLE_TOPICS = [
+    "Human liver spheroids predict drug-induced liver injury",
+    "A microphysiological system for hepatotoxicity screening",
+    "Organ-on-chip models of the human liver sinusoid",
+    "3D cell culture of primary hepatocytes for DILI risk assessment",
+    "Mechanistic modelling of bile acid transport inhibition",
+    "Transcriptomic signatures of hepatic steatosis in vitro",
+]
+MESH = ["Hepatocytes", "Spheroids, Cellular", "Chemical and Drug Induced Liver Injury", "Lab-On-A-Chip Devices", "Humans"]
+
+
+def author_xml(rnd: random.Random) -> str:
+    first = rnd.choice(FIRST_NAMES)
+    last = rnd.choice(LAST_NAMES)
+    affs = []
+    for template in rnd.sample(AFFILIATIONS, rnd.choice([0, 1, 1, 1, 2])):
+        email = f"{first[0].lower()}.{last.lower()}@example-{rnd.randint(1, 40)}.com"
+        affs.append(
+            f"<AffiliationInfo><Affiliation>{escape(template.format(email=email))}</Affiliation></AffiliationInfo>"
+        )
+    return (
+        f'<Author ValidYN="Y"><LastName>{last}</LastName><ForeName>{first}</ForeName>'
+        f"<Initials>{first[0]}</Initials>{''.join(affs)}</Author>"
+    )
+
+
+def article_xml(pmid: int, rnd: random.Random) -> str:
+    authors = [author_xml(rnd) for _ in range(rnd.randint(1, 12))]
+    if rnd.random() < 0.05:
+        authors.append('<Author ValidYN="Y"><CollectiveName>MIP-DILI Consortium</CollectiveName></Author>')
+    mesh = "".join(
+        f'<MeshHeading><DescriptorName UI="D{rnd.randint(100000, 999999)}" MajorTopicYN="N">{m}</DescriptorName></MeshHeading>'
+        for m in rnd.sample(MESH, 3)
+    )
+    refs = "".join(
+        f'<Reference><Citation>Reference {r} et al. J Tox. 2021;{r}:1-10.</Citation>'
+        f'<ArticleIdList><ArticleId IdType="pubmed">{pmid - r - 1000}</ArticleId></ArticleIdList></Reference>'
+        for r in range(rnd.randint(5, 25))
+    )
+    return f"""<PubmedArticle>
+<MedlineCitation Status="MEDLINE" Owner="NLM" IndexingMethod="Automated"><PMID Version="1">{pmid}</PMID>
+<DateCompleted><Year>2024</Year><Month>03</Month><Day>{rnd.randint(10, 28)}</Day></DateCompleted>
+<Article PubModel="Print-Electronic"><Journal><ISSN IssnType="Electronic">1096-0929</ISSN><JournalIssue CitedMedium="Internet"><Volume>{rnd.randint(180, 200)}</Volume><Issue>2</Issue><PubDate><Year>2024</Year><Month>Mar</Month></PubDate></JournalIssue><Title>Toxicological sciences : an official journal of the Society of Toxicology</Title><ISOAbbreviation>Toxicol Sci</ISOAbbreviation></Journal>
+<ArticleTitle>{rnd.choice(TITLE_TOPICS)} ({pmid}).</ArticleTitle>
+<Pagination><StartPage>{rnd.randint(1, 400)}</StartPage></Pagination>
+<Abstract><AbstractText Label="BACKGROUND">{"Drug-induced liver injury remains a leading cause of attrition. " * rnd.randint(2, 6)}</AbstractText><AbstractText Label="RESULTS">{"Spheroids recapitulated clinical hepatotoxicity. " * rnd.randint(2, 6)}</AbstractText></Abstract>
+<AuthorList CompleteYN="Y">{"".join(authors)}</AuthorList>
+<Language>eng</Language><PublicationTypeList><PublicationType UI="D016428">Journal Article</PublicationType></PublicationTypeList>
+</Article>
+<MedlineJournalInfo><Country>United States</Country><MedlineTA>Toxicol Sci</MedlineTA></MedlineJournalInfo>
+<MeshHeadingList>{mesh}</MeshHeadingList>
+</MedlineCitation>
+<PubmedData><History><PubMedPubDate PubStatus="entrez"><Year>2024</Year><Month>1</Month><Day>5</Day></PubMedPubDate></History><PublicationStatus>ppublish</PublicationStatus>
+<ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId><ArticleId IdType="doi">10.1093/toxsci/kfad{pmid % 1000:03d}</ArticleId></ArticleIdList>
+<ReferenceList>{refs}</ReferenceList></PubmedData>
+</PubmedArticle>
+"""
+
+
+def build(count: int, seed: int = 0) -> bytes:
+    rnd = random.Random(seed)
+    body = "".join(article_xml(38000000 + i, rnd) for i in range(count))
+    return (
+        '<?xml version="1.0" ?>\n'
+        '<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2024//EN" '
+        '"https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_240101.dtd">\n'
+        f"<PubmedArticleSet>\n{body}</PubmedArticleSet>\n"
+    ).encode("utf-8")
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    path = os.path.join(os.path.dirname(__file__), "efetch_sample.xml")
+    with open(path, "wb") as f:
+        f.write(build(count))
+    print(f"Wrote {count} articles to {path}")
+
+
+if __name__ == "__main__":
+    main()
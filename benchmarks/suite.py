@@ -0,0 +1,257 @@
+"""
+Benchmark suite for the pipeline stages: lead generation, ranking, paper
+extraction, efetch XML parsing and JSON export. Datasets are seeded
+synthetic leads (1k to 1M) and the recorded efetch fixture, so runs are
+reproducible and need no network.
+
+Each stage is timed in fixed-size batches, best of `--repeats` runs for
+throughput, with per-item latency percentiles over all batches. A separate
+tracemalloc pass measures peak memory. Results can be saved as a named
+baseline and compared against one: a throughput drop or peak memory growth
+beyond `--threshold` is flagged as a regression (exit code 1). The 1M
+tier takes several minutes; pass smaller `--sizes` for a quick check.
+
+Usage: python -m benchmarks.suite [--sizes 1000,10000] [--stages rank,export]
+                                  [--save-baseline NAME] [--compare NAME]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from agent.exporter import EXPORTERS, LAZY_FIELDS
+from agent.generator import DataGenerator
+from agent.main_real import extract_leads_from_papers
+from agent.ranker import ProbabilityEngine
+from agent.records import to_leads
+from agent.scrapers.pubmed_parser import iter_articles
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "efetch_sample.xml")
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000]
+BATCH_SIZE = 1_000
+# Paper stages are ~100x slower per item than lead stages; cap their dataset
+MAX_PAPERS = 20_000
+
+
+@dataclass
+class Stage:
+    name: str
+    unit: str
+    # size -> list of batches; run(batch) processes one batch and returns its item count
+    prepare: Callable[[int, int], list]
+    run: Callable[[object], int]
+
+
+def _chunks(items: list, size: int = BATCH_SIZE) -> list:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _records(size: int, seed: int) -> list:
+    random.seed(seed)
+    return DataGenerator().generate_sample_records(count=size)
+
+
+def _fixture_papers(size: int) -> list:
+    with open(FIXTURE, "rb") as f:
+        papers = list(iter_articles([f.read()]))
+    count = min(size, MAX_PAPERS)
+    return [papers[i % len(papers)] for i in range(count)]
+
+
+# --- Stages --------------------------------------------------------------
+
+def _prepare_generate(size: int, seed: int) -> list:
+    # (seed, count) per batch, so every batch draws the same leads on every run
+    return [(seed + i, min(BATCH_SIZE, size - start)) for i, start in enumerate(range(0, size, BATCH_SIZE))]
+
+
+def _run_generate(batch) -> int:
+    batch_seed, count = batch
+    random.seed(batch_seed)
+    return len(DataGenerator().generate_sample_records(count=count))
+
+
+_ENGINE = ProbabilityEngine()
+
+
+def _run_rank(batch) -> int:
+    return len(_ENGINE.rank_leads(batch))
+
+
+def _run_extract(batch) -> int:
+    # Extraction prints a line per candidate; keep it out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        extract_leads_from_papers(batch, max_leads=len(batch) * 2)
+    return len(batch)
+
+
+def _prepare_parse(size: int, seed: int) -> list:
+    with open(FIXTURE, "rb") as f:
+        payload = f.read()
+    # Stream the fixture in 64 KB blocks, like response.iter_content()
+    blocks = [payload[i:i + 65536] for i in range(0, len(payload), 65536)]
+    per_payload = payload.count(b"<PubmedArticle>")
+    return [blocks] * max(1, min(size, MAX_PAPERS) // per_payload)
+
+
+def _run_parse(batch) -> int:
+    return sum(1 for _ in iter_articles(batch))
+
+
+def _run_export(batch) -> int:
+    # Record -> Lead conversion plus the JSON writer, as export_leads does
+    EXPORTERS["json"](to_leads(batch), io.BytesIO(), LAZY_FIELDS)
+    return len(batch)
+
+
+STAGES: Dict[str, Stage] = {
+    "generate": Stage("generate", "leads", _prepare_generate, _run_generate),
+    "rank": Stage("rank", "leads", lambda size, seed: _chunks(_records(size, seed)), _run_rank),
+    "extract": Stage("extract", "papers", lambda size, seed: _chunks(_fixture_papers(size), 100), _run_extract),
+    "parse": Stage("parse", "papers", _prepare_parse, _run_parse),
+    "export": Stage("export", "leads", lambda size, seed: _chunks(_records(size, seed)), _run_export),
+}
+
+
+# --- Measurement ---------------------------------------------------------
+
+def measure(stage: Stage, size: int, seed: int, repeats: int) -> dict:
+    batches = stage.prepare(size, seed)
+
+    best = None
+    latencies = []  # per-item latency of every batch, in microseconds
+    for _ in range(repeats):
+        total = 0.0
+        items = 0
+        for batch in batches:
+            start = time.perf_counter()
+            n = stage.run(batch)
+            elapsed = time.perf_counter() - start
+            total += elapsed
+            items += n
+            latencies.append(elapsed / max(n, 1) * 1e6)
+        best = total if best is None else min(best, total)
+
+    # Memory in a separate pass: tracemalloc slows allocation down
+    tracemalloc.start()
+    for batch in batches:
+        stage.run(batch)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "stage": stage.name,
+        "size": size,
+        "items": items,
+        "unit": stage.unit,
+        "throughput": round(items / best, 1),
+        "p50_us": round(float(p50), 2),
+        "p95_us": round(float(p95), 2),
+        "p99_us": round(float(p99), 2),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def compare(results: List[dict], baseline: dict, threshold: float) -> List[str]:
+    """
+    Regressions against `baseline`: throughput down or peak memory up by
+    more than `threshold` (a fraction) for the same stage and size.
+    """
+    previous = {(r["stage"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = previous.get((r["stage"], r["size"]))
+        if old is None:
+            continue
+        speed = r["throughput"] / old["throughput"] - 1
+        memory = r["peak_mb"] / old["peak_mb"] - 1 if old["peak_mb"] else 0.0
+        if speed < -threshold:
+            regressions.append(f"{r['stage']}@{r['size']:,}: throughput {speed:+.1%} ({old['throughput']:,.0f} -> {r['throughput']:,.0f} {r['unit']}/s)")
+        if memory > threshold:
+            regressions.append(f"{r['stage']}@{r['size']:,}: peak memory {memory:+.1%} ({old['peak_mb']:.2f} -> {r['peak_mb']:.2f} MB)")
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline benchmark suite.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="comma-separated dataset sizes")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of: {', '.join(STAGES)}")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--save-baseline", metavar="NAME", help="save results as benchmarks/baselines/NAME.json")
+    parser.add_argument("--compare", metavar="NAME", help="compare against benchmarks/baselines/NAME.json")
+    parser.add_argument("--threshold", type=float, default=0.10, help="regression threshold as a fraction (default 0.10)")
+    parser.add_argument("--out", help="also write the results JSON here")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    names = args.stages.split(",")
+    unknown = [n for n in names if n not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    print(f"{'stage':<9} {'size':>9} {'throughput':>16} {'p50 us':>9} {'p95 us':>9} {'p99 us':>9} {'peak MB':>8}")
+    results = []
+    for name in names:
+        for size in sizes:
+            r = measure(STAGES[name], size, args.seed, args.repeats)
+            results.append(r)
+            print(
+                f"{r['stage']:<9} {size:>9,} {r['throughput']:>11,.0f} {r['unit'][0]}/s"
+                f"{'':>2} {r['p50_us']:>9.1f} {r['p95_us']:>9.1f} {r['p99_us']:>9.1f} {r['peak_mb']:>8.2f}"
+            )
+
+    report = {"environment": environment(), "seed": args.seed, "repeats": args.repeats, "results": results}
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        path = baseline_path(args.save_baseline)
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline: {path}")
+
+    if args.compare:
+        with open(baseline_path(args.compare)) as f:
+            baseline = json.load(f)
+        if baseline["environment"] != report["environment"]:
+            print(f"\nNote: baseline '{args.compare}' was recorded on a different environment: {baseline['environment']}")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} vs. '{args.compare}':")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.threshold:.0%} vs. '{args.compare}'.")
+
+
+if __name__ == "__main__":
+    main()
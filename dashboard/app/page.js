@@ -2,6 +2,16 @@ import { promises as fs } from 'fs';
 import path from 'path';
 import LeadTable from '@/components/LeadTable';
 
+// When set, the table queries agent/query_service.py page by page instead of
+// shipping the whole leads file to the browser
+const LEADS_API_URL = process.env.NEXT_PUBLIC_LEADS_API_URL;
+
+async function getLeadCount() {
+  const res = await fetch(`${LEADS_API_URL}/leads?page_size=1`, { cache: 'no-store' });
+  const data = await res.json();
+  return data.total || 0;
+}
+
 async function getLeads() {
   // Simulating external data fetch by reading local JSON
   const filePath = path.join(process.cwd(), 'public', 'leads_data.json');
@@ -12,7 +22,8 @@ async function getLeads() {
 }
 
 export default async function Home() {
-  const leads = await getLeads();
+  const leads = LEADS_API_URL ? [] : await getLeads();
+  const leadCount = LEADS_API_URL ? await getLeadCount() : leads.length;
 
   return (
     <main className="min-h-screen p-8 max-w-7xl mx-auto">
@@ -27,13 +38,13 @@ export default async function Home() {
         </div>
         <div className="text-right">
           <div className="text-3xl font-bold text-white bg-clip-text" style={{ textShadow: '0 0 10px rgba(255,0,127,0.5)' }}>
-            {leads.length}
+            {leadCount}
           </div>
           <div className="text-[10px] text-zinc-500 uppercase tracking-[0.2em]">Active Targets</div>
         </div>
       </div>
 
-      <LeadTable leads={leads} />
+      <LeadTable leads={leads} apiUrl={LEADS_API_URL} />
     </main>
   );
 }
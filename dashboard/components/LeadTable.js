@@ -1,12 +1,55 @@
 "use client";
-import React, { useState, useMemo } from 'react';
+import React, { useState, useMemo, useEffect } from 'react';
 import ScoreBadge from './ScoreBadge';
 
-export default function LeadTable({ leads }) {
+const PAGE_SIZE = 50;
+// Wait for a pause in typing before querying the API
+const SEARCH_DEBOUNCE_MS = 250;
+
+// With `apiUrl` set, search/sort/paging run server-side (agent/query_service.py)
+// and only the visible page is loaded; otherwise `leads` is filtered in the browser.
+export default function LeadTable({ leads = [], apiUrl }) {
     const [search, setSearch] = useState('');
+    const [debouncedSearch, setDebouncedSearch] = useState('');
     const [sortConfig, setSortConfig] = useState({ key: 'score', direction: 'desc' });
+    const [page, setPage] = useState(1);
+    const [remote, setRemote] = useState({ leads: [], total: 0 });
+
+    const queryString = (extra = {}) => new URLSearchParams({
+        q: debouncedSearch,
+        sort: sortConfig.key,
+        order: sortConfig.direction,
+        ...extra,
+    }).toString();
+
+    useEffect(() => {
+        const timer = setTimeout(() => setDebouncedSearch(search), SEARCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [search]);
+
+    useEffect(() => {
+        setPage(1);
+    }, [debouncedSearch, sortConfig]);
+
+    useEffect(() => {
+        if (!apiUrl) return;
+        // Each new query aborts the previous one, and a response that still
+        // lands after its abort is dropped, so older results never win
+        const controller = new AbortController();
+        fetch(`${apiUrl}/leads?${queryString({ page, page_size: PAGE_SIZE })}`, { signal: controller.signal })
+            .then((res) => res.json())
+            .then((data) => {
+                if (controller.signal.aborted) return;
+                setRemote({ leads: data.leads || [], total: data.total || 0 });
+            })
+            .catch((err) => {
+                if (err.name !== 'AbortError') console.error('Lead query failed', err);
+            });
+        return () => controller.abort();
+    }, [apiUrl, debouncedSearch, sortConfig, page]);
 
     const filteredLeads = useMemo(() => {
+        if (apiUrl) return remote.leads;
         let result = [...leads];
         if (search) {
             const q = search.toLowerCase();
@@ -33,7 +76,9 @@ export default function LeadTable({ leads }) {
         });
 
         return result;
-    }, [leads, search, sortConfig]);
+    }, [leads, search, sortConfig, apiUrl, remote]);
+
+    const pageCount = Math.max(1, Math.ceil(remote.total / PAGE_SIZE));
 
     const handleSort = (key) => {
         let direction = 'desc';
@@ -44,6 +89,12 @@ export default function LeadTable({ leads }) {
     };
 
     const downloadCSV = () => {
+        if (apiUrl) {
+            // The query service streams the full filtered result as CSV
+            window.location.href = `${apiUrl}/leads.csv?${queryString({ q: search })}`;
+            return;
+        }
+
         const headers = [
             'Rank', 'Probability', 'Name', 'Title', 'Company', 'Location HQ', 'Email', 'LinkedIn'
         ];
@@ -129,6 +180,14 @@ export default function LeadTable({ leads }) {
                     </table>
                 </div>
             </div>
+
+            {apiUrl && (
+                <div className="flex gap-4 mt-4 justify-end items-center text-xs text-zinc-500">
+                    <button onClick={() => setPage(page - 1)} disabled={page <= 1} className="btn-primary py-1 px-3">PREV</button>
+                    <span>PAGE {page} / {pageCount} ({remote.total} LEADS)</span>
+                    <button onClick={() => setPage(page + 1)} disabled={page >= pageCount} className="btn-primary py-1 px-3">NEXT</button>
+                </div>
+            )}
         </div>
     );
 }
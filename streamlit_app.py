@@ -4,6 +4,8 @@ import json
 import os
 from agent.generator import DataGenerator
 from agent.ranker import ProbabilityEngine
+from agent.scoring_rules import load_export_rules, rules_path_for
+from agent.search_index import SearchIndex, fingerprint, index_path_for
 
 # Page Config - Set theme
 st.set_page_config(
@@ -70,37 +72,42 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-def load_data():
-    # Load logic - Try to load from json, else generate
-    json_path = "dashboard/public/leads_data.json"
-    
-    data = []
-    if os.path.exists(json_path):
-        with open(json_path, "r") as f:
+ARROW_PATH = "dashboard/public/leads_data.arrow"
+JSON_PATH = "dashboard/public/leads_data.json"
+# Written by the agent next to the export; shared by the JSON and Arrow files
+INDEX_PATH = index_path_for(JSON_PATH)
+
+def _file_mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+# Cached per (path, mtime): slider moves and other reruns reuse the loaded frame,
+# and a new agent export (new mtime) invalidates it. cache_resource avoids the
+# copy st.cache_data would make of the memory-mapped columns.
+@st.cache_resource(max_entries=2)
+def load_table(path, mtime):
+    if path == ARROW_PATH:
+        import pyarrow as pa
+        # Zero-copy: Arrow-backed columns stay views onto the memory-mapped IPC file
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    if path == JSON_PATH:
+        with open(path, "r") as f:
             data = json.load(f)
     else:
         # Fallback to generating live if file missing
         gen = DataGenerator()
         leads = gen.generate_sample_leads(100)
         ranker = ProbabilityEngine()
-        ranked = ranker.rank_leads(leads)
+        ranked = ranker.explain(ranker.rank_leads(leads))
         data = [l.model_dump() for l in ranked]
 
     if not data:
         return pd.DataFrame()
+    # Nested company dicts become company_* columns
+    df = pd.json_normalize(data, sep="_")
 
-    # Flatten logic
-    flat_data = []
-    for item in data:
-        # Ensure company is a dict (it should be)
-        if 'company' in item and isinstance(item['company'], dict):
-            comp = item.pop('company')
-            item.update({f"company_{k}": v for k, v in comp.items()})
-        
-        flat_data.append(item)
-            
-    df = pd.DataFrame(flat_data)
-    
     # Ensure critical columns exist (migration safety)
     if 'email' not in df.columns:
         df['email'] = 'Unavailable'
@@ -109,6 +116,49 @@ def load_data():
         
     return df
 
+# The rules the export was scored with, to render score_mask/score_keys
+@st.cache_resource(max_entries=2)
+def load_rules(path, mtime):
+    return load_export_rules(path)
+
+def breakdown_for(row):
+    # Exports carry the compact mask; older ones and live data the text itself
+    if 'score_mask' in row and pd.notna(row['score_mask']):
+        path = rules_path_for(JSON_PATH)
+        rules = load_rules(path, _file_mtime(path))
+        return rules.render(int(row['score_mask']), int(row['score_keys']))
+    return list(row.get('score_breakdown', []))
+
+def data_source():
+    # Load logic - Prefer the columnar store the agent writes (unless the JSON
+    # export is newer), then JSON, else generate
+    arrow_mtime = _file_mtime(ARROW_PATH)
+    json_mtime = _file_mtime(JSON_PATH)
+
+    if arrow_mtime is not None and (json_mtime is None or arrow_mtime >= json_mtime):
+        return ARROW_PATH, arrow_mtime
+    if json_mtime is not None:
+        return JSON_PATH, json_mtime
+    return None, None
+
+def load_data():
+    return load_table(*data_source())
+
+# Cached per data/index version; `_df` is excluded from Streamlit's cache key.
+# Uses the saved index when it was built for these leads, else builds one.
+@st.cache_resource(max_entries=2)
+def load_search(path, mtime, index_mtime, _df):
+    index = SearchIndex.load(INDEX_PATH, fingerprint(_df['id'].astype(str)))
+    if index is not None:
+        return index
+    get = lambda col: _df[col] if col in _df.columns else [""] * len(_df)
+    pubs = _df['publications'] if 'publications' in _df.columns else [()] * len(_df)
+    leads = [
+        {"id": i, "name": n, "title": t, "company": {"name": c, "location_hq": h}, "publications": list(p)}
+        for i, n, t, c, h, p in zip(_df['id'], get('name'), get('title'), get('company_name'), get('company_location_hq'), pubs)
+    ]
+    return SearchIndex.build(leads)
+
 st.title("🧬 LeadLattice")
 st.caption("AI-Powered Lead Identification & Ranking System")
 
@@ -116,6 +166,7 @@ st.caption("AI-Powered Lead Identification & Ranking System")
 with st.sidebar:
     st.header("Filters")
     min_score = st.slider("Min Probability Score", 0, 100, 50)
+    search = st.text_input("Search", placeholder="Name, title, company, location, publications...")
     
     st.markdown("---")
     st.info("**System Status**\n\n🟢 Agent: Active\n\n🟢 Model: v1.0.2")
@@ -125,7 +176,10 @@ df = load_data()
 
 # Process Data for Display
 if not df.empty:
-    # Filter
+    # Filter - text matches come back from the inverted index best match first
+    if search:
+        docs, _ = load_search(*data_source(), _file_mtime(INDEX_PATH), df).search(search)
+        df = df.iloc[docs]
     filtered_df = df[df['score'] >= min_score].copy()
     
     # KPIs
@@ -173,6 +227,18 @@ if not df.empty:
         height=600
     )
     
+    # Detail view - the breakdown is only rendered for the lead picked here
+    with st.expander("Score breakdown"):
+        top = filtered_df.head(500)
+        if not top.empty:
+            pick = st.selectbox(
+                "Lead",
+                range(len(top)),
+                format_func=lambda i: f"{top['name'].iloc[i]} ({top['company_name'].iloc[i]}) - {top['score'].iloc[i]:.0f}%",
+            )
+            for line in breakdown_for(top.iloc[pick]):
+                st.markdown(f"- {line}")
+
     # Download
     csv = filtered_df.to_csv(index=False).encode('utf-8')
     st.download_button(
@@ -0,0 +1,48 @@
+from agent.entity_resolution import EntityResolver
+from agent.records import CompanyRecord, LeadRecord
+from agent.scrapers.linkedin_discoverer import linkedin_search_url
+
+COMPANY = CompanyRecord(name="Genentech Inc", industry="Biotech/Pharma", location_hq="South San Francisco")
+
+
+def _lead(name: str, paper: str, linkedin_url: str = None, email: str = "Unavailable") -> LeadRecord:
+    return LeadRecord(
+        id=name,
+        name=name,
+        title=f"Author on: {paper}",
+        company=COMPANY,
+        location_person="Unknown",
+        email=email,
+        linkedin_url=linkedin_url or linkedin_search_url(name),
+        publications=(paper,),
+    )
+
+
+def test_initial_merges_into_full_name_and_search_url_follows():
+    resolver = EntityResolver()
+    resolver.resolve([_lead("J. Smith", "Liver spheroids"), _lead("John Smith", "DILI models", email="js@gene.com")])
+
+    [entity] = resolver.entities
+    assert entity.name == "John Smith"
+    assert entity.publications == ("Liver spheroids", "DILI models")
+    assert entity.email == "js@gene.com"
+    assert entity.linkedin_url == linkedin_search_url("John Smith")
+
+
+def test_found_profile_is_kept_over_search_url():
+    profile = "www.linkedin.com/in/john-smith"
+    resolver = EntityResolver()
+    resolver.resolve([_lead("John Smith", "Liver spheroids", linkedin_url=profile), _lead("John R Smith", "DILI models")])
+    assert resolver.entities[0].name == "John R Smith"
+    assert resolver.entities[0].linkedin_url == profile
+
+    resolver = EntityResolver()
+    resolver.resolve([_lead("J. Smith", "Liver spheroids"), _lead("J. Smith", "DILI models", linkedin_url=profile)])
+    assert resolver.entities[0].linkedin_url == profile
+
+
+def test_different_given_names_stay_separate():
+    resolver = EntityResolver()
+    resolver.resolve([_lead("John Smith", "Liver spheroids"), _lead("James Smith", "DILI models")])
+    assert [e.name for e in resolver.entities] == ["John Smith", "James Smith"]
+    assert [e.linkedin_url for e in resolver.entities] == [linkedin_search_url("John Smith"), linkedin_search_url("James Smith")]
@@ -0,0 +1,95 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from agent.scrapers import http_client
+from agent.scrapers.http_client import build_session, request_with_retry
+
+
+class StubServer:
+    """
+    Local HTTP server answering each request with the next scripted
+    (status, headers) pair; the last one repeats.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.requests = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                status, headers = stub.script[min(stub.requests, len(stub.script) - 1)]
+                stub.requests += 1
+                body = b"ok" if status == 200 else b"error"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/efetch.fcgi"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    # Record backoff delays instead of waiting them out
+    delays = []
+    monkeypatch.setattr(http_client.time, "sleep", delays.append)
+    return delays
+
+
+def run(script, **kwargs):
+    stub = StubServer(script)
+    try:
+        kwargs.setdefault("backoff", 0.5)
+        return stub, request_with_retry(build_session(), "GET", stub.url, stream=True, **kwargs)
+    finally:
+        stub.close()
+
+
+def test_retries_server_errors_with_exponential_backoff(sleeps):
+    stub, response = run([(503, {}), (502, {}), (200, {})])
+    assert response.status_code == 200
+    assert response.content == b"ok"
+    assert stub.requests == 3
+    # backoff * 2**attempt plus up to `backoff` of jitter
+    assert 0.5 <= sleeps[0] <= 1.0
+    assert 1.0 <= sleeps[1] <= 1.5
+
+
+def test_retry_after_overrides_backoff(sleeps):
+    stub, response = run([(429, {"Retry-After": "7"}), (200, {})])
+    assert response.status_code == 200
+    assert sleeps == [7.0]
+
+
+def test_client_errors_are_not_retried(sleeps):
+    with pytest.raises(requests.HTTPError):
+        run([(404, {}), (200, {})])
+    assert sleeps == []
+
+
+def test_gives_up_after_max_retries(sleeps):
+    stub = StubServer([(503, {})])
+    try:
+        with pytest.raises(requests.HTTPError):
+            request_with_retry(build_session(), "GET", stub.url, max_retries=2, backoff=0.5)
+    finally:
+        stub.close()
+    assert stub.requests == 3
+    assert len(sleeps) == 2
@@ -0,0 +1,42 @@
+from agent.company_resolver import Affiliation, CompanyResolver
+from agent.json_cache import JsonLRUCache
+
+
+def test_round_trip_under_the_same_rules_version(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = JsonLRUCache(path, max_entries=10)
+    cache.load("v1")
+    cache.put("a", (1, "x"))
+    cache.save()
+
+    reloaded = JsonLRUCache(path, max_entries=10)
+    reloaded.load("v1")
+    assert reloaded.get("a") == (1, "x")
+    assert reloaded.get("b") is None
+    assert reloaded.stats() == "1 hits / 1 misses (50.0% reused)"
+
+    stale = JsonLRUCache(path, max_entries=10)
+    stale.load("v2")
+    assert stale.get("a") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = JsonLRUCache(None, max_entries=2)
+    cache.put("a", (1,))
+    cache.put("b", (2,))
+    cache.get("a")
+    cache.put("c", (3,))
+    assert list(cache.entries) == ["a", "c"]
+
+
+def test_company_resolver_reloads_affiliations(tmp_path):
+    path = str(tmp_path / "company_cache.json")
+    resolver = CompanyResolver(path=path)
+    first = resolver.resolve("Genentech Inc., South San Francisco, CA")
+    resolver.save()
+
+    reloaded = CompanyResolver(path=path)
+    entry = reloaded.resolve("Genentech Inc., South San Francisco, CA")
+    assert entry == first
+    assert isinstance(entry, Affiliation)
+    assert reloaded.stats().startswith("1 hits / 0 misses")
@@ -0,0 +1,44 @@
+import threading
+
+import pytest
+
+from agent.pipeline import prefetch
+
+
+def _source(closed: list):
+    try:
+        yield from range(1_000_000)
+    finally:
+        closed.append(threading.current_thread().name)
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "prefetch"]
+
+
+def test_early_close_stops_producer_and_closes_source():
+    closed = []
+    items = prefetch(_source(closed), maxsize=4)
+    assert [next(items) for _ in range(10)] == list(range(10))
+    items.close()
+    assert closed == ["prefetch"]
+    assert _prefetch_threads() == []
+
+
+def test_consumer_error_stops_producer_and_closes_source():
+    closed = []
+    with pytest.raises(KeyError):
+        for item in prefetch(_source(closed), maxsize=4):
+            if item == 5:
+                raise KeyError(item)
+    assert closed == ["prefetch"]
+    assert _prefetch_threads() == []
+
+
+def test_producer_error_is_reraised():
+    def failing():
+        yield 1
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        list(prefetch(failing()))
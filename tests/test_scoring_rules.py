@@ -0,0 +1,61 @@
+import copy
+import json
+import random
+
+import pytest
+
+from agent.batch import LeadBatch
+from agent.generator import DataGenerator
+from agent.matcher import KeywordMatcher
+from agent.ranker import ProbabilityEngine
+from agent.scoring_rules import DEFAULT_RULES_PATH, ScoringRules
+
+
+def _spec_with_weights(weights: dict) -> dict:
+    with open(DEFAULT_RULES_PATH) as f:
+        spec = json.load(f)
+    for rule in spec["rules"]:
+        rule["weight"] = weights.get(rule["name"], rule["weight"])
+    return spec
+
+
+@pytest.mark.parametrize("weights", [{}, {"funding": 20.0}, {"funding": 20.0, "role": 30.5}])
+def test_rank_batch_matches_rank_leads(weights):
+    random.seed(0)
+    leads = DataGenerator().generate_sample_leads(count=500)
+    batch = LeadBatch.from_leads(leads)
+    engine = ProbabilityEngine(rules=_spec_with_weights(weights))
+
+    per_lead = engine.rank_leads(copy.deepcopy(leads))
+    batched = engine.rank_batch(batch, leads).apply_to(leads)
+
+    assert [(l.id, l.score, l.rank_tier, l.score_mask, l.score_keys) for l in batched] == [
+        (l.id, l.score, l.rank_tier, l.score_mask, l.score_keys) for l in per_lead
+    ]
+
+
+@pytest.mark.parametrize("bad", ["", "   ", None, 3])
+def test_rejects_empty_or_non_string_keywords(bad):
+    spec = _spec_with_weights({})
+    spec["rules"][0]["keywords"].append(bad)
+    with pytest.raises(ValueError, match="Rule 'role'"):
+        ScoringRules(spec)
+
+
+def test_matcher_with_empty_keyword_terminates():
+    assert KeywordMatcher(["a", ""]).first_index("xyz") == 1
+    assert KeywordMatcher(["a", ""]).first_index("") == 1
+
+
+def test_no_tiers_gives_every_lead_the_default_tier():
+    random.seed(0)
+    leads = DataGenerator().generate_sample_leads(count=200)
+    spec = _spec_with_weights({})
+    spec["tiers"] = []
+    engine = ProbabilityEngine(rules=spec)
+
+    per_lead = engine.rank_leads(copy.deepcopy(leads))
+    batched = engine.rank_batch(LeadBatch.from_leads(leads), leads).apply_to(leads)
+
+    assert {l.rank_tier for l in per_lead} == {spec["default_tier"]}
+    assert [(l.id, l.score, l.rank_tier) for l in batched] == [(l.id, l.score, l.rank_tier) for l in per_lead]